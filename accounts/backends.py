@@ -0,0 +1,17 @@
+from django.contrib.auth.backends import ModelBackend
+
+from .hashing import hashing_executor, needs_rehash, rehash_in_background
+
+
+class RehashingModelBackend(ModelBackend):
+    '''
+    ModelBackend that upgrades the stored hash of a user who just logged in
+    with an outdated iteration count, on the hashing pool when it has a
+    worker free
+    '''
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        user = super().authenticate(request, username=username, password=password, **kwargs)
+        if user is not None and needs_rehash(user.password):
+            hashing_executor.run_in_background(rehash_in_background, user.pk, user.password, password)
+        return user
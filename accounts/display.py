@@ -0,0 +1,100 @@
+"""
+Process-wide cache of the user fields shown next to topics and posts.
+
+Listings show the same few thousand active users over and over, so rather
+than joining `auth_user` on every listing query the rows are resolved here:
+one bulk query for the ids that are not cached, nothing at all for the rest.
+
+Entries expire after `USER_DISPLAY_CACHE_TTL` seconds and the least recently
+used are dropped beyond `USER_DISPLAY_CACHE_SIZE`. Saving or deleting a user
+invalidates their entry in this process; other processes catch up once the
+entry expires.
+"""
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.contrib.auth.models import User
+
+UserDisplay = namedtuple('UserDisplay', ['id', 'username'])
+DISPLAY_FIELDS = UserDisplay._fields
+
+
+class UserDisplayCache:
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, user_ids):
+        found = {}
+        missing = set()
+        now = time.monotonic()
+        with self._lock:
+            for user_id in set(user_ids):
+                entry = self._entries.get(user_id)
+                if entry is not None and entry[1] > now:
+                    self._entries.move_to_end(user_id)
+                    found[user_id] = entry[0]
+                else:
+                    missing.add(user_id)
+            self.hits += len(found)
+            self.misses += len(missing)
+
+        if missing:
+            rows = User.objects.filter(pk__in=missing).values_list(*DISPLAY_FIELDS)
+            loaded = {row[0]: UserDisplay(*row) for row in rows}
+            self.set_many(loaded)
+            found.update(loaded)
+        return found
+
+    def set_many(self, displays):
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            for user_id, display in displays.items():
+                self._entries[user_id] = (display, expires)
+                self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+user_display_cache = UserDisplayCache(
+    maxsize=getattr(settings, 'USER_DISPLAY_CACHE_SIZE', 5000),
+    ttl=getattr(settings, 'USER_DISPLAY_CACHE_TTL', 300)
+)
+
+
+def attach_users(objects, id_attr, display_attr):
+    '''
+    Sets `display_attr` on each object to the UserDisplay for its `id_attr`
+    '''
+    objects = list(objects)
+    displays = user_display_cache.get_many(getattr(obj, id_attr) for obj in objects)
+    for obj in objects:
+        setattr(obj, display_attr, displays.get(getattr(obj, id_attr)))
+    return objects
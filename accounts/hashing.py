@@ -0,0 +1,147 @@
+"""
+Password hashing on a small, bounded pool of threads.
+
+PBKDF2 is deliberately slow and hashlib releases the GIL while it runs, so a
+burst of logins or signups would otherwise put one busy core behind every
+request thread and leave nothing for reads. Hashes are instead computed on at
+most `PASSWORD_HASHING_WORKERS` threads, with up to `PASSWORD_HASHING_QUEUE`
+more requests waiting for one. Beyond that `HashingSaturated` is raised and
+`HashingSaturatedMiddleware` answers 503 with a Retry-After header.
+
+Stored hashes whose iteration count differs from `PASSWORD_PBKDF2_ITERATIONS`
+are upgraded after a successful login, on the pool when it has spare
+capacity, rather than by Django on the login request itself. The upgrade is
+scheduled by `RehashingModelBackend` (accounts/backends.py), which knows
+the user, so it is an UPDATE by primary key.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, identify_hasher, make_password
+from django.contrib.auth.models import User
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+_pool_thread = threading.local()
+
+
+class HashingSaturated(Exception):
+
+    def __init__(self, retry_after):
+        super().__init__(f'Password hashing is saturated, retry after {retry_after}s')
+        self.retry_after = retry_after
+
+
+class HashingExecutor:
+
+    def __init__(self, workers, max_queue, retry_after):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.pending = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._pool = None
+
+    @property
+    def pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix='password-hashing',
+                    initializer=setattr, initargs=(_pool_thread, 'active', True)
+                )
+            return self._pool
+
+    def run(self, func, *args):
+        '''
+        Runs `func` on the pool and waits for its result, raising
+        HashingSaturated when all workers are busy and the queue is full
+        '''
+        if getattr(_pool_thread, 'active', False):
+            return func(*args)
+        with self._lock:
+            if self.pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HashingSaturated(self.retry_after)
+            self.pending += 1
+        try:
+            return self.pool.submit(func, *args).result()
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    def run_in_background(self, func, *args):
+        '''
+        Runs `func` on the pool if a worker is free, otherwise drops it
+        '''
+        with self._lock:
+            if self.pending >= self.workers:
+                return False
+            self.pending += 1
+        future = self.pool.submit(func, *args)
+        future.add_done_callback(self._background_done)
+        return True
+
+    def _background_done(self, future):
+        with self._lock:
+            self.pending -= 1
+        if future.exception() is not None:
+            logger.error('Background password hashing failed', exc_info=future.exception())
+
+
+hashing_executor = HashingExecutor(
+    workers=getattr(settings, 'PASSWORD_HASHING_WORKERS', 2),
+    max_queue=getattr(settings, 'PASSWORD_HASHING_QUEUE', 32),
+    retry_after=getattr(settings, 'PASSWORD_HASHING_RETRY_AFTER', 5)
+)
+
+
+def needs_rehash(encoded):
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+    return isinstance(hasher, BoundedPBKDF2PasswordHasher) and hasher.needs_rehash(encoded)
+
+
+def rehash(user_pk, encoded, password):
+    '''
+    Replaces the user's stored hash `encoded` with one at the current cost,
+    unless the password was changed in the meantime
+    '''
+    return User.objects.filter(pk=user_pk, password=encoded).update(password=make_password(password))
+
+
+def rehash_in_background(user_pk, encoded, password):
+    try:
+        rehash(user_pk, encoded, password)
+    finally:
+        connection.close()
+
+
+class BoundedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    '''
+    PBKDF2PasswordHasher that hashes on `hashing_executor`. It keeps the
+    `pbkdf2_sha256` algorithm name, so it replaces Django's hasher in
+    PASSWORD_HASHERS. Iteration counts are upgraded in the background by
+    accounts.backends.RehashingModelBackend.
+    '''
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_PBKDF2_ITERATIONS', PBKDF2PasswordHasher.iterations)
+
+    def encode(self, password, salt, iterations=None):
+        return hashing_executor.run(super().encode, password, salt, iterations)
+
+    def needs_rehash(self, encoded):
+        return super().must_update(encoded)
+
+    def must_update(self, encoded):
+        # Django would rehash on the request thread, the backend does it later
+        return False
@@ -0,0 +1,24 @@
+from django.http import HttpResponse
+
+from .hashing import HashingSaturated
+
+
+class HashingSaturatedMiddleware:
+    '''
+    Turns HashingSaturated from a login or signup into a 503 asking the
+    client to retry, instead of a server error
+    '''
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, HashingSaturated):
+            return None
+        response = HttpResponse('Too many logins at once, please try again shortly.', status=503,
+                                content_type='text/plain')
+        response['Retry-After'] = exception.retry_after
+        return response
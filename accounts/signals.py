@@ -0,0 +1,18 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .display import DISPLAY_FIELDS, user_display_cache
+
+
+@receiver(post_save, sender=User)
+def invalidate_display_on_save(sender, instance, update_fields=None, **kwargs):
+    # Logging in saves last_login only, which is not displayed
+    if update_fields is not None and not set(update_fields) & set(DISPLAY_FIELDS):
+        return
+    user_display_cache.invalidate(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_display_on_delete(sender, instance, **kwargs):
+    user_display_cache.invalidate(instance.pk)
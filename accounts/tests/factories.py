@@ -0,0 +1,22 @@
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+
+from ..display import user_display_cache
+
+
+def make_users(*usernames, password='abcde12345', **fields):
+    '''
+    Users named `usernames`, in that order, created with one INSERT and
+    sharing a single hash of `password`. bulk_create skips save() and its
+    signals, so the display cache invalidation they would trigger is done
+    here.
+    '''
+    encoded = make_password(password)
+    User.objects.bulk_create(User(username=username, password=encoded, **fields) for username in usernames)
+    # bulk_create leaves the primary keys unset on SQLite
+    users = User.objects.in_bulk(usernames, field_name='username')
+    # SQLite hands out the primary keys of rolled back test users again,
+    # which the cache may still hold the old usernames for
+    for user in users.values():
+        user_display_cache.invalidate(user.pk)
+    return [users[username] for username in usernames]
@@ -0,0 +1,70 @@
+from unittest import mock
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+
+from ..display import UserDisplay, UserDisplayCache, attach_users, user_display_cache
+from .factories import make_users
+
+
+class UserDisplayCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ama, cls.john, cls.kofi = make_users('ama', 'john', 'kofi')
+
+    def setUp(self):
+        self.cache = UserDisplayCache(maxsize=2, ttl=60)
+
+    def test_misses_resolved_in_one_query(self):
+        with self.assertNumQueries(1):
+            displays = self.cache.get_many([self.ama.pk, self.john.pk, self.ama.pk])
+        self.assertEqual(displays[self.ama.pk], UserDisplay(self.ama.pk, 'ama'))
+        self.assertEqual(self.cache.stats()['misses'], 2)
+
+    def test_hits_need_no_query(self):
+        self.cache.get_many([self.ama.pk])
+        with self.assertNumQueries(0):
+            displays = self.cache.get_many([self.ama.pk])
+        self.assertEqual(displays[self.ama.pk].username, 'ama')
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+    def test_least_recently_used_evicted(self):
+        self.cache.get_many([self.ama.pk])
+        self.cache.get_many([self.john.pk])
+        self.cache.get_many([self.ama.pk])
+        self.cache.get_many([self.kofi.pk])
+        with self.assertNumQueries(1):
+            self.cache.get_many([self.john.pk])
+        with self.assertNumQueries(0):
+            self.cache.get_many([self.kofi.pk])
+
+    def test_entries_expire(self):
+        self.cache.get_many([self.ama.pk])
+        with mock.patch('accounts.display.time.monotonic', return_value=10 ** 9):
+            with self.assertNumQueries(1):
+                self.cache.get_many([self.ama.pk])
+
+
+class UserDisplayInvalidationTests(TestCase):
+
+    def setUp(self):
+        user_display_cache.clear()
+        self.user = User.objects.create_user(username='ama', password='abcde12345')
+
+    def test_username_change_invalidates(self):
+        user_display_cache.get_many([self.user.pk])
+        self.user.username = 'ama_k'
+        self.user.save()
+        self.assertEqual(user_display_cache.get_many([self.user.pk])[self.user.pk].username, 'ama_k')
+
+    def test_login_keeps_entry(self):
+        user_display_cache.get_many([self.user.pk])
+        self.client.login(username='ama', password='abcde12345')
+        self.assertEqual(user_display_cache.stats()['size'], 1)
+
+    def test_attach_users(self):
+        class Row:
+            starter_id = self.user.pk
+        rows = attach_users([Row()], 'starter_id', 'starter_display')
+        self.assertEqual(rows[0].starter_display.username, 'ama')
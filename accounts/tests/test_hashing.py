@@ -0,0 +1,101 @@
+import threading
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from ..hashing import BoundedPBKDF2PasswordHasher, HashingExecutor, HashingSaturated, rehash, rehash_in_background
+
+
+class HashingExecutorTests(TestCase):
+
+    def setUp(self):
+        self.executor = HashingExecutor(workers=1, max_queue=0, retry_after=7)
+        self.release = threading.Event()
+        self.busy = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def block_worker(self):
+        def wait():
+            self.busy.set()
+            self.release.wait(5)
+        thread = threading.Thread(target=self.executor.run, args=(wait,))
+        thread.start()
+        self.busy.wait(5)
+        return thread
+
+    def test_runs_on_pool(self):
+        self.assertTrue(self.executor.run(lambda: threading.current_thread().name).startswith('password-hashing'))
+
+    def test_saturated(self):
+        thread = self.block_worker()
+        with self.assertRaises(HashingSaturated) as raised:
+            self.executor.run(lambda: None)
+        self.assertEqual(raised.exception.retry_after, 7)
+        self.release.set()
+        thread.join()
+        self.assertEqual(self.executor.run(lambda: 'done'), 'done')
+        self.assertEqual(self.executor.rejected, 1)
+
+    def test_background_work_dropped_when_busy(self):
+        thread = self.block_worker()
+        self.assertFalse(self.executor.run_in_background(lambda: None))
+        self.release.set()
+        thread.join()
+        self.assertTrue(self.executor.run_in_background(lambda: None))
+
+
+# The test settings use a fast hasher, these tests need the real one
+BOUNDED_HASHERS = ['accounts.hashing.BoundedPBKDF2PasswordHasher']
+
+
+@override_settings(PASSWORD_HASHERS=BOUNDED_HASHERS)
+class HashingSaturatedMiddlewareTests(TestCase):
+
+    def test_login_returns_503(self):
+        User.objects.create_user(username='john', password='abcdef123456')
+        with mock.patch('accounts.hashing.hashing_executor.run', side_effect=HashingSaturated(5)):
+            response = self.client.post(reverse('login'), {'username': 'john', 'password': 'abcdef123456'})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '5')
+
+
+@override_settings(PASSWORD_HASHERS=BOUNDED_HASHERS, PASSWORD_PBKDF2_ITERATIONS=2000)
+class RehashTests(TestCase):
+
+    def setUp(self):
+        self.old_hash = BoundedPBKDF2PasswordHasher().encode('abcdef123456', 'salt', iterations=1000)
+        self.user = User.objects.create(username='john', password=self.old_hash)
+
+    def test_login_leaves_rehash_to_the_pool(self):
+        with mock.patch('accounts.hashing.hashing_executor.run_in_background') as run_in_background:
+            self.assertTrue(self.client.login(username='john', password='abcdef123456'))
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, self.old_hash)
+        run_in_background.assert_called_once_with(rehash_in_background, self.user.pk, self.old_hash, 'abcdef123456')
+
+    def test_rehash(self):
+        self.assertEqual(rehash(self.user.pk, self.old_hash, 'abcdef123456'), 1)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$2000$'))
+        self.assertTrue(self.user.check_password('abcdef123456'))
+
+    def test_rehash_only_touches_the_user(self):
+        other = User.objects.create(username='ama', password=self.old_hash)
+        rehash(self.user.pk, self.old_hash, 'abcdef123456')
+        other.refresh_from_db()
+        self.assertEqual(other.password, self.old_hash)
+
+    def test_rehash_skipped_after_password_change(self):
+        self.user.set_password('new_password123')
+        self.user.save()
+        self.assertEqual(rehash(self.user.pk, self.old_hash, 'abcdef123456'), 0)
+        self.assertTrue(self.user.check_password('new_password123'))
+
+    def test_current_hash_not_rehashed(self):
+        self.user.set_password('abcdef123456')
+        self.user.save()
+        with mock.patch('accounts.hashing.hashing_executor.run_in_background') as run_in_background:
+            self.assertTrue(self.client.login(username='john', password='abcdef123456'))
+        run_in_background.assert_not_called()
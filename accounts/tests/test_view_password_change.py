@@ -1,7 +1,7 @@
 from django.test import TestCase
 from django.shortcuts import reverse
-from django.contrib.auth.models import User
-from django.forms
+
+from .factories import make_users
 
 class LoginRequiredPasswordChangeTests(TestCase):
     def test_redirection(self):
@@ -16,10 +16,13 @@ class LoginRequiredPasswordChangeTests(TestCase):
 
 class PasswordChangeTestCase(TestCase):
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, = make_users('ama', email='ama@example.com', password='abcde12345')
+
     def setUp(self, data={}):
-        self.user = User.objects.create_user(username='ama', email='ama@example.com', password='abcde12345')
         self.url = reverse('password_change')
-        self.client.login(username=self.user.username, password=self.user.password)
+        self.client.login(username=self.user.username, password='abcde12345')
         self.response = self.client.post(self.url, data)
 
 class SuccessfulPasswordChangeTests(PasswordChangeTestCase):
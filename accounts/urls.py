@@ -1,39 +1,36 @@
 from django.urls import path
-from django.contrib.auth.views import (LogoutView, LoginView, 
-                        PasswordResetView, PasswordResetDoneView,
-                        PasswordResetConfirmView, PasswordResetCompleteView,
-                        PasswordResetCompleteView, PasswordChangeView,
-                        PasswordChangeDoneView, 
-                        )
+
+from maker_board.lazy_urls import LazyView
 
 from .views import signup
 
+# Auth views are imported on their first request, see maker_board.lazy_urls
 urlpatterns = [
     path('signup/', signup, name='signup'),
-    path('reset/', PasswordResetView.as_view(
+    path('reset/', LazyView('django.contrib.auth.views.PasswordResetView',
         template_name='accounts/password_reset.html', 
         email_template_name='accounts/password_reset_email.html',
         subject_template_name='accounts/password_reset_subject.txt'
     ), name='password_reset'),
-    path('reset/done/', PasswordResetDoneView.as_view(
+    path('reset/done/', LazyView('django.contrib.auth.views.PasswordResetDoneView',
         template_name='accounts/password_reset_done.html'), 
         name='password_reset_done'),
-    path('reset/<uidb64>/<token>/', PasswordResetConfirmView.as_view(
+    path('reset/<uidb64>/<token>/', LazyView('django.contrib.auth.views.PasswordResetConfirmView',
         template_name='accounts/password_reset_confirm.html'),
         name='password_reset_confirm'
         ),
-    path('reset/complete/', PasswordResetCompleteView.as_view(
+    path('reset/complete/', LazyView('django.contrib.auth.views.PasswordResetCompleteView',
         template_name='accounts/password_reset_complete.html'), 
         name='password_reset_complete'
         ),
-    path('settings/password/', PasswordChangeView.as_view(
+    path('settings/password/', LazyView('django.contrib.auth.views.PasswordChangeView',
         template_name='accounts/password_change.html'), 
         name='password_change'
     ),
-    path('settings/password/done/', PasswordChangeDoneView.as_view(
+    path('settings/password/done/', LazyView('django.contrib.auth.views.PasswordChangeDoneView',
         template_name='accounts/password_change_done.html'), 
         name='password_change_done'
     ),
-    path('logout/', LogoutView.as_view(), name='logout'),
-    path('login', LoginView.as_view(template_name='accounts/login.html'), name='login')
-]
\ No newline at end of file
+    path('logout/', LazyView('django.contrib.auth.views.LogoutView'), name='logout'),
+    path('login', LazyView('django.contrib.auth.views.LoginView', template_name='accounts/login.html'), name='login')
+]
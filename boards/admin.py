@@ -1,8 +1,132 @@
-from django.contrib import admin
+import re
 
-from .models import Board
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.core.paginator import Paginator
+from django.template.response import TemplateResponse
+from django.utils.functional import cached_property
+
+from .models import Board, Topic, Post
+from .moderation import delete_posts, delete_topics, move_topics
+
+class LimitedCountPaginator(Paginator):
+    '''
+    Counts at most `limit` rows, so a changelist over a large table never runs a full COUNT(*)
+    '''
+    limit = 10000
+
+    @cached_property
+    def count(self):
+        return self.object_list.order_by()[:self.limit].count()
+
+class MoveToBoardForm(forms.Form):
+    board = forms.ModelChoiceField(queryset=Board.objects.all())
+
+class PatternForm(forms.Form):
+    pattern = forms.CharField(max_length=255, help_text='Regular expression, matched case-insensitively')
+
+    def clean_pattern(self):
+        pattern = self.cleaned_data['pattern']
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            raise forms.ValidationError(f'Invalid regular expression: {e}')
+        return pattern
+
+class ModerationAdmin(admin.ModelAdmin):
+    show_full_result_count = False
+    paginator = LimitedCountPaginator
+    list_per_page = 50
+    pattern_field = None
+    # Set-based delete for the model, from boards.moderation
+    bulk_delete = None
+
+    def get_actions(self, request):
+        # The default action loads every selected object and deletes them one by one
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    def intermediate_form(self, request, form, title):
+        '''
+        Intermediate page for actions that need extra input. Returns the bound
+        form once it is submitted and valid, otherwise the page to render.
+        '''
+        if 'apply' in request.POST and form.is_valid():
+            return form, None
+        context = {
+            **self.admin_site.each_context(request),
+            'title': title,
+            'opts': self.model._meta,
+            'form': form,
+            'action': request.POST['action'],
+            'select_across': request.POST.get('select_across', '0'),
+            'selected': request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+        }
+        return None, TemplateResponse(request, 'admin/boards/action_form.html', context)
+
+    def delete_selected_fast(self, request, queryset):
+        deleted = self.bulk_delete(queryset)
+        self.message_user(request, f'Deleted {deleted} {self.model._meta.verbose_name_plural}.', messages.SUCCESS)
+    delete_selected_fast.short_description = 'Delete selected %(verbose_name_plural)s'
+
+    def delete_matching_pattern(self, request, queryset):
+        data = request.POST if 'apply' in request.POST else None
+        form, response = self.intermediate_form(request, PatternForm(data), 'Delete everything matching a pattern')
+        if response:
+            return response
+        lookup = {f'{self.pattern_field}__iregex': form.cleaned_data['pattern']}
+        deleted = self.bulk_delete(self.model.objects.filter(**lookup))
+        self.message_user(request, f'Deleted {deleted} {self.model._meta.verbose_name_plural}.', messages.SUCCESS)
+    delete_matching_pattern.short_description = 'Delete all %(verbose_name_plural)s matching a pattern'
+
+class TopicAdmin(ModerationAdmin):
+    list_display = ['subject', 'board', 'starter', 'post_count', 'last_updated']
+    list_filter = ['board']
+    list_select_related = ['board', 'starter']
+    search_fields = ['subject']
+    raw_id_fields = ['board', 'starter']
+    actions = ['delete_selected_fast', 'move_to_board', 'delete_by_starter', 'delete_matching_pattern']
+    pattern_field = 'subject'
+    bulk_delete = staticmethod(delete_topics)
+
+    def move_to_board(self, request, queryset):
+        data = request.POST if 'apply' in request.POST else None
+        form, response = self.intermediate_form(request, MoveToBoardForm(data), 'Move topics to board')
+        if response:
+            return response
+        moved = move_topics(queryset, form.cleaned_data['board'])
+        self.message_user(request, f'Moved {moved} topics to {form.cleaned_data["board"]}.', messages.SUCCESS)
+    move_to_board.short_description = 'Move selected topics to another board'
+
+    def delete_by_starter(self, request, queryset):
+        # Materialized, since the selected topics are among those being deleted
+        starters = list(queryset.order_by().values_list('starter', flat=True).distinct())
+        deleted = delete_topics(Topic.objects.filter(starter__in=starters))
+        self.message_user(request, f'Deleted {deleted} topics.', messages.SUCCESS)
+    delete_by_starter.short_description = 'Delete every topic started by the starters of the selected topics'
+
+class PostAdmin(ModerationAdmin):
+    list_display = ['id', 'topic', 'created_by', 'created_at']
+    list_select_related = ['topic', 'created_by']
+    search_fields = ['message']
+    raw_id_fields = ['topic', 'created_by', 'updated_by']
+    actions = ['delete_selected_fast', 'delete_by_author', 'delete_matching_pattern']
+    pattern_field = 'message'
+    bulk_delete = staticmethod(delete_posts)
+
+    def delete_by_author(self, request, queryset):
+        authors = list(queryset.order_by().values_list('created_by', flat=True).distinct())
+        deleted = delete_posts(Post.objects.filter(created_by__in=authors))
+        self.message_user(request, f'Deleted {deleted} posts.', messages.SUCCESS)
+    delete_by_author.short_description = 'Delete every post by the authors of the selected posts'
 
 class BoardAdmin(admin.ModelAdmin):
-    list_display = ['name', 'description']
+    list_display = ['name', 'description', 'topic_count', 'post_count']
+    readonly_fields = ['topic_count', 'post_count']
 
-admin.site.register(Board, BoardAdmin)
\ No newline at end of file
+admin.site.register(Board, BoardAdmin)
+admin.site.register(Topic, TopicAdmin)
+admin.site.register(Post, PostAdmin)
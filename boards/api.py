@@ -0,0 +1,231 @@
+"""
+Read-only JSON API.
+
+Rows are serialized straight from `values()` and only the columns named in
+`?fields=` are selected. Topic lists are cursor-paginated on
+(last_updated, id), so a page costs one index range scan however deep it is.
+Every view declares a query budget: the number of queries it ran is sent in
+`X-Query-Count` and going over budget is logged.
+"""
+import base64
+import json
+import logging
+from functools import wraps
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+from django.http import JsonResponse
+from django.shortcuts import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import require_GET
+
+from .models import Board, Topic
+
+logger = logging.getLogger(__name__)
+
+BOARD_FIELDS = {
+    'id': 'id',
+    'name': 'name',
+    'description': 'description',
+    'topic_count': 'topic_count',
+    'post_count': 'post_count',
+}
+TOPIC_FIELDS = {
+    'id': 'id',
+    'subject': 'subject',
+    'board_id': 'board_id',
+    'starter_id': 'starter_id',
+    'starter_username': 'starter__username',
+    'post_count': 'post_count',
+    'hot_score': 'hot_score',
+    'last_updated': 'last_updated',
+}
+# Always selected, since the next cursor is built from them
+TOPIC_CURSOR_FIELDS = ['last_updated', 'id']
+TOPIC_ORDERING = [F('last_updated').desc(), F('id').desc()]
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+MAX_BOARDS = 50
+
+
+class BadRequest(Exception):
+    pass
+
+
+class NotFound(Exception):
+    pass
+
+
+class QueryCounter:
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def query_budget(budget):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                try:
+                    response = view(request, *args, **kwargs)
+                except BadRequest as e:
+                    response = api_response({'error': str(e)}, status=400)
+                except NotFound as e:
+                    response = api_response({'error': str(e)}, status=404)
+            if counter.count > budget:
+                logger.warning('%s ran %d queries, over its budget of %d', request.path, counter.count, budget)
+            response['X-Query-Count'] = counter.count
+            return response
+        wrapper.query_budget = budget
+        return wrapper
+    return decorator
+
+
+def api_response(data, status=200):
+    return JsonResponse(data, status=status, encoder=DjangoJSONEncoder, json_dumps_params={'separators': (',', ':')})
+
+
+def selected_fields(request, allowed):
+    requested = request.GET.get('fields')
+    if not requested:
+        return list(allowed)
+    fields = [name for name in requested.split(',') if name]
+    unknown = set(fields) - set(allowed)
+    if unknown:
+        raise BadRequest(f'Unknown fields: {", ".join(sorted(unknown))}')
+    return fields
+
+
+def values_arguments(fields, allowed):
+    '''
+    `values()` arguments selecting `fields` under their API names
+    '''
+    names = [allowed[name] for name in fields if allowed[name] == name]
+    expressions = {name: F(allowed[name]) for name in fields if allowed[name] != name}
+    return names, expressions
+
+
+def parse_limit(request):
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise BadRequest('limit must be a number')
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def encode_cursor(row):
+    # Not DjangoJSONEncoder, which cuts microseconds down to milliseconds
+    value = json.dumps([row['last_updated'].isoformat(), row['id']])
+    return base64.urlsafe_b64encode(value.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        last_updated, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        last_updated = parse_datetime(last_updated)
+        pk = int(pk)
+    except (ValueError, TypeError):
+        raise BadRequest('Invalid cursor')
+    if last_updated is None:
+        raise BadRequest('Invalid cursor')
+    return Q(last_updated__lt=last_updated) | Q(last_updated=last_updated, id__lt=pk)
+
+
+def raw_datetime(value):
+    '''
+    Raw cursors skip the model field's conversion, so SQLite hands back naive UTC values
+    '''
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    if settings.USE_TZ and timezone.is_naive(value):
+        value = timezone.make_aware(value, timezone.utc)
+    return value
+
+
+def topic_page(rows, fields, limit, board_pk):
+    '''
+    Trims the extra row fetched to detect a next page and drops columns the client did not ask for
+    '''
+    page = {'results': [], 'next': None}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        url = reverse('api_board_topics', kwargs={'pk': board_pk})
+        page['next'] = f'{url}?cursor={encode_cursor(rows[-1])}&limit={limit}'
+        if fields != list(TOPIC_FIELDS):
+            page['next'] += f'&fields={",".join(fields)}'
+    page['results'] = [{name: row[name] for name in fields} for row in rows]
+    return page
+
+
+@require_GET
+@gzip_page
+@query_budget(1)
+def boards(request):
+    names, expressions = values_arguments(selected_fields(request, BOARD_FIELDS), BOARD_FIELDS)
+    rows = Board.objects.order_by('name').values(*names, **expressions)
+    return api_response({'results': list(rows)})
+
+
+@require_GET
+@gzip_page
+@query_budget(2)
+def board_topics(request, pk):
+    if not Board.objects.filter(pk=pk).exists():
+        raise NotFound('Board not found')
+    fields = selected_fields(request, TOPIC_FIELDS)
+    limit = parse_limit(request)
+    names, expressions = values_arguments(list(dict.fromkeys(fields + TOPIC_CURSOR_FIELDS)), TOPIC_FIELDS)
+
+    topics = Topic.objects.filter(board_id=pk)
+    if request.GET.get('cursor'):
+        topics = topics.filter(decode_cursor(request.GET['cursor']))
+    rows = list(topics.order_by(*TOPIC_ORDERING).values(*names, **expressions)[:limit + 1])
+    return api_response(topic_page(rows, fields, limit, pk))
+
+
+@require_GET
+@gzip_page
+@query_budget(1)
+def topics(request):
+    '''
+    First page of topics for many boards in one query: ROW_NUMBER() over each
+    board's topics, keeping the first `limit` + 1 rows of every board
+    '''
+    try:
+        board_pks = [int(pk) for pk in request.GET.get('boards', '').split(',') if pk]
+    except ValueError:
+        raise BadRequest('boards must be a comma separated list of ids')
+    if not board_pks or len(board_pks) > MAX_BOARDS:
+        raise BadRequest(f'Pass between 1 and {MAX_BOARDS} board ids in boards')
+    fields = selected_fields(request, TOPIC_FIELDS)
+    limit = parse_limit(request)
+    names, expressions = values_arguments(list(dict.fromkeys(fields + TOPIC_CURSOR_FIELDS + ['board_id'])), TOPIC_FIELDS)
+
+    ranked = Topic.objects.filter(board_id__in=board_pks).annotate(
+        row_number=Window(RowNumber(), partition_by=[F('board_id')], order_by=TOPIC_ORDERING)
+    ).values(*names, 'row_number', **expressions)
+    sql, params = ranked.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT * FROM ({sql}) ranked WHERE row_number <= %s', (*params, limit + 1))
+        columns = [column[0] for column in cursor.description]
+        rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    per_board = {pk: [] for pk in board_pks}
+    for row in sorted(rows, key=lambda row: row['row_number']):
+        row['last_updated'] = raw_datetime(row['last_updated'])
+        per_board[row['board_id']].append(row)
+
+    return api_response({
+        'results': {str(pk): topic_page(rows, fields, limit, pk) for pk, rows in per_board.items()}
+    })
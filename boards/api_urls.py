@@ -0,0 +1,9 @@
+from django.urls import path
+
+from . import api
+
+urlpatterns = [
+    path('boards/', api.boards, name='api_boards'),
+    path('boards/<int:pk>/topics/', api.board_topics, name='api_board_topics'),
+    path('topics/', api.topics, name='api_topics')
+]
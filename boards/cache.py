@@ -0,0 +1,89 @@
+"""
+Full-page cache for anonymous readers.
+
+Pages are keyed by path and query string plus a per-path generation number,
+so purging a path (every query string variant of it) is a single increment.
+Generation numbers start from the clock, see `page_generation`.
+Both live in the default cache, which has to be shared between worker
+processes for a purge to reach all of them (see CACHES in settings).
+"""
+import threading
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+GENERATION_PREFIX = 'page-generation:'
+PAGE_PREFIX = 'page:'
+
+
+def page_cache_key(request):
+    '''
+    Key for the page at `request`. Only the query parameters named in
+    PAGE_CACHE_QUERY_PARAMS are part of it, in sorted order, so made-up
+    parameters can't fill the cache with copies of the same page.
+    '''
+    path = request.path
+    generation = page_generation(path)
+    params = sorted(getattr(settings, 'PAGE_CACHE_QUERY_PARAMS', ()))
+    query = urlencode([(name, value) for name in params for value in request.GET.getlist(name)])
+    return f'{PAGE_PREFIX}{path}:{generation}:{query}'
+
+
+def page_generation(path):
+    '''
+    The generation of the pages at `path`. Counters start from the clock
+    rather than from zero, so one that the cache evicted (the file cache
+    culls entries at random) never comes back to a generation that pages
+    are still stored under.
+    '''
+    key = GENERATION_PREFIX + path
+    generation = cache.get(key)
+    if generation is None:
+        seed = time.time_ns()
+        cache.add(key, seed, None)
+        generation = cache.get(key, seed)
+    return generation
+
+
+def purge_pages(*paths):
+    for path in paths:
+        try:
+            cache.incr(GENERATION_PREFIX + path)
+        except ValueError:
+            cache.set(GENERATION_PREFIX + path, time.time_ns(), None)
+
+
+class SingleFlight:
+    '''
+    Coalesces concurrent calls for the same key: the first caller runs the
+    function while later callers wait for it to finish and then try `lookup`
+    before falling back to running the function themselves.
+    '''
+
+    def __init__(self, timeout=10):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func, lookup):
+        with self._lock:
+            done = self._calls.get(key)
+            leader = done is None
+            if leader:
+                done = self._calls[key] = threading.Event()
+
+        if not leader:
+            done.wait(self.timeout)
+            result = lookup()
+            if result is not None:
+                return result
+            return func()
+
+        try:
+            return func()
+        finally:
+            with self._lock:
+                del self._calls[key]
+            done.set()
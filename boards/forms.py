@@ -1,6 +1,6 @@
 from django import forms
 
-from .models import Topic
+from .models import Topic, Post
 
 class NewTopicForm(forms.ModelForm):
     message = forms.CharField(
@@ -11,4 +11,13 @@ class NewTopicForm(forms.ModelForm):
 
     class Meta:
         model = Topic
-        fields = ['subject','message']
\ No newline at end of file
+        fields = ['subject','message']
+
+class PostForm(forms.ModelForm):
+
+    class Meta:
+        model = Post
+        fields = ['message', 'version']
+        widgets = {
+            'version': forms.HiddenInput()
+        }
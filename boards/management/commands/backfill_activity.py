@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from ...moderation import CHUNK_SIZE
+from ...stats import backfill_activity
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the user and board activity rollups from the posts table, one chunk of posts at a time'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Posts per transaction')
+
+    def handle(self, *args, **options):
+        done = backfill_activity(
+            chunk_size=options['chunk_size'],
+            progress=lambda done: self.stdout.write(f'{done} posts counted')
+        )
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt activity rollups from {done} posts'))
@@ -0,0 +1,80 @@
+from django.core.management.base import BaseCommand
+from django.template import engines
+
+from accounts.forms import SignUpForm
+from maker_board.benchmark import benchmark_database, best_of
+
+from ...forms import NewTopicForm, PostForm
+
+# templates/includes/form.html before it was replaced by {% render_form %}
+LEGACY_FORM_TEMPLATE = '''{% load form_tags widget_tweaks %}
+
+{% if form.non_field_errors %}
+<div class="alert alert-danger" role="alert">
+    {% for error in form.non_field_errors %}
+    <p{% if forloop.last %} class="mb-0" {% endif %}>{{ error }}</p>
+        {% endfor %}
+</div>
+{% endif %}
+
+{% for field in form.hidden_fields %}
+{{ field }}
+{% endfor %}
+
+{% for field in form.visible_fields %}
+<div class="form-group">
+    {{ field.label_tag }}
+
+
+    {% render_field field class=field|input_class %}
+    {% for error in field.errors %}
+    <div class="text-danger">
+        {{ error }}
+    </div>
+    {% endfor %}
+
+    {% if field.help_text %}
+    <small class="form-text text-muted">{{ field.help_text|safe }}</small>
+    {% endif %}
+</div>
+{% endfor %}'''
+
+RENDER_FORM_TEMPLATE = '{% load form_tags %}{% render_form form %}'
+
+FORMS = [
+    ('sign up', lambda: SignUpForm()),
+    ('sign up, invalid', lambda: SignUpForm({'username': 'ama', 'email': 'ama', 'password1': 'a', 'password2': 'b'})),
+    ('new topic', lambda: NewTopicForm()),
+    ('new topic, invalid', lambda: NewTopicForm({'subject': 'Hello'})),
+    ('edit post', lambda: PostForm(initial={'version': 1})),
+]
+
+
+class Command(BaseCommand):
+    help = 'Measures rendering the site forms with the template loop and with {% render_form %}'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--renders', type=int, default=500, help='Renders per timing')
+
+    def handle(self, *args, **options):
+        engine = engines['django']
+        templates = [
+            ('template loop', engine.from_string(LEGACY_FORM_TEMPLATE)),
+            ('render_form', engine.from_string(RENDER_FORM_TEMPLATE)),
+        ]
+        renders = options['renders']
+
+        # Validating the sign up form looks the username up
+        with benchmark_database():
+            for label, make_form in FORMS:
+                form = make_form()
+                form.is_valid()
+                timings = []
+                for _, template in templates:
+                    context = {'form': form}
+                    timings.append(best_of(lambda: [template.render(context) for _ in range(renders)]) / renders)
+                self.stdout.write(
+                    f'{label:>18}: ' +
+                    '   '.join(f'{name} {ms * 1000:7.1f} us' for (name, _), ms in zip(templates, timings)) +
+                    f'   {timings[0] / timings[1]:4.1f}x'
+                )
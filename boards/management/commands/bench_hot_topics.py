@@ -0,0 +1,81 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from maker_board.benchmark import benchmark_database, best_of
+
+from ...models import Board, Topic, Post
+from ...ranking import hot_score
+
+
+def naive_hot_topics(topics, limit):
+    '''
+    What ranking looks like without a stored score: aggregate every topic's posts and sort in Python
+    '''
+    topics = topics.annotate(num_posts=Count('posts'), last_post=Max('posts__created_at'))
+    ranked = sorted(topics, key=lambda t: hot_score(t.num_posts, t.last_post or t.last_updated), reverse=True)
+    return ranked[:limit]
+
+
+def indexed_hot_topics(topics, limit):
+    return list(topics.order_by('-hot_score')[:limit])
+
+
+class Command(BaseCommand):
+    help = 'Compares the stored hot_score ranking against ranking with an aggregate query over posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--boards', type=int, default=10)
+        parser.add_argument('--topics', type=int, default=10000)
+        parser.add_argument('--posts', type=int, default=100000)
+        parser.add_argument('--limit', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            self.populate(options['boards'], options['topics'], options['posts'])
+            board = Board.objects.first()
+            limit = options['limit']
+
+            for label, topics in [('board', board.topics.all()), ('site-wide', Topic.objects.all())]:
+                naive = best_of(lambda: naive_hot_topics(topics, limit))
+                indexed = best_of(lambda: indexed_hot_topics(topics, limit))
+                same = [t.pk for t in naive_hot_topics(topics, limit)] == [t.pk for t in indexed_hot_topics(topics, limit)]
+                self.stdout.write(
+                    f'{label:>10}: aggregate {naive:8.2f} ms   indexed {indexed:6.2f} ms   '
+                    f'{naive / indexed:6.1f}x   same ranking: {same}'
+                )
+
+            self.stdout.write(board.topics.order_by('-hot_score')[:limit].explain())
+
+    def populate(self, num_boards, num_topics, num_posts):
+        rng = random.Random(42)
+        now = timezone.now()
+        user = User.objects.create_user(username='bench')
+        Board.objects.bulk_create(
+            Board(name=f'Board {i}', description='Benchmark board') for i in range(num_boards)
+        )
+        boards = list(Board.objects.all())
+        Topic.objects.bulk_create(
+            (Topic(subject=f'Topic {i}', board=rng.choice(boards), starter=user) for i in range(num_topics)),
+            batch_size=500
+        )
+        topic_ids = list(Topic.objects.values_list('pk', flat=True))
+
+        # Zipf-like reply counts, with each topic last active sometime in the past two weeks
+        weights = [1 / (rank + 1) for rank in range(len(topic_ids))]
+        Post.objects.bulk_create(
+            (Post(message='Benchmark post', topic_id=topic_id, created_by=user)
+             for topic_id in rng.choices(topic_ids, weights, k=num_posts)),
+            batch_size=500
+        )
+        topics = list(Topic.objects.annotate(num_posts=Count('posts')))
+        for topic in topics:
+            topic.last_updated = now - timedelta(seconds=rng.randint(0, 14 * 24 * 3600))
+            topic.post_count = topic.num_posts
+            topic.hot_score = hot_score(topic.num_posts, topic.last_updated)
+            Post.objects.filter(topic=topic).update(created_at=topic.last_updated)
+        Topic.objects.bulk_update(topics, ['last_updated', 'post_count', 'hot_score'], batch_size=500)
@@ -0,0 +1,76 @@
+import time
+import tracemalloc
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.shortcuts import reverse
+from django.test import Client, override_settings
+
+from maker_board.benchmark import benchmark_database
+
+from ...models import Board, Topic
+
+# (label, STREAMING_LISTING_THRESHOLD, Accept-Encoding, PAGE_CACHE_TIMEOUT, clear the cache first)
+MODES = [
+    ('buffered', 10 ** 9, '', 0, False),
+    ('buffered + gzip', 10 ** 9, 'gzip', 0, False),
+    ('streamed', 0, '', 0, False),
+    ('streamed + gzip', 0, 'gzip', 0, False),
+    # Anonymous readers with the page cache on, as they are served in production
+    ('page cache miss', 0, 'gzip', 300, True),
+    ('page cache hit', 0, 'gzip', 300, False),
+]
+
+
+class Command(BaseCommand):
+    help = 'Measures time to first byte, total time, peak memory and size of a long board_topics page'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--topics', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=3, help='Timed requests per mode, the fastest is reported')
+
+    def handle(self, *args, **options):
+        # A private cache, since the benchmark clears it
+        caches = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        with benchmark_database(), override_settings(CACHES=caches, ALLOWED_HOSTS=['testserver']):
+            user = User.objects.create_user(username='bench')
+            board = Board.objects.create(name='Benchmark', description='Benchmark board', topic_count=options['topics'])
+            Topic.objects.bulk_create(
+                (Topic(subject=f'Topic {i}', board=board, starter=user) for i in range(options['topics'])),
+                batch_size=500
+            )
+            url = reverse('board_topics', kwargs={'pk': board.pk})
+
+            for label, threshold, encoding, page_cache_timeout, clear in MODES:
+                # Settings are read when the middleware is set up, so each mode gets a new client
+                with override_settings(STREAMING_LISTING_THRESHOLD=threshold, PAGE_CACHE_TIMEOUT=page_cache_timeout):
+                    client = Client()
+                    cache.clear()
+                    self.fetch(client, url, encoding)
+                    timings = [self.fetch(client, url, encoding, clear) for _ in range(options['repeat'])]
+                    first_byte, total, size = min(timings, key=lambda timing: timing[1])
+                    tracemalloc.start()
+                    self.fetch(client, url, encoding, clear)
+                    peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                self.stdout.write(
+                    f'{label:>16}: first byte {first_byte * 1000:7.1f} ms   total {total * 1000:7.1f} ms   '
+                    f'peak memory {peak / 2 ** 20:6.1f} MiB   {size / 1024:7.1f} KiB'
+                )
+
+    def fetch(self, client, url, encoding, clear=False):
+        if clear:
+            cache.clear()
+        start = time.perf_counter()
+        response = client.get(url, HTTP_ACCEPT_ENCODING=encoding)
+        if not response.streaming:
+            elapsed = time.perf_counter() - start
+            return elapsed, elapsed, len(response.content)
+
+        chunks = iter(response.streaming_content)
+        size = len(next(chunks))
+        first_byte = time.perf_counter() - start
+        for chunk in chunks:
+            size += len(chunk)
+        return first_byte, time.perf_counter() - start, size
@@ -0,0 +1,95 @@
+import statistics
+import threading
+import time
+from collections import Counter
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.shortcuts import reverse
+from django.test import Client, override_settings
+
+from maker_board.benchmark import benchmark_database
+
+from ...models import Board, Topic
+
+HASHERS = [
+    ('no logins', None),
+    ('request thread', 'django.contrib.auth.hashers.PBKDF2PasswordHasher'),
+    ('bounded pool', 'accounts.hashing.BoundedPBKDF2PasswordHasher'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Measures home and board_topics latency for a reader while a burst of logins hashes passwords'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16, help='Threads logging in')
+        parser.add_argument('--logins', type=int, default=4, help='Logins per thread')
+        parser.add_argument('--reads', type=int, default=40, help='Reads measured without a burst')
+
+    def handle(self, *args, **options):
+        # The page cache would answer every read without rendering it
+        with benchmark_database(on_disk=True), override_settings(PAGE_CACHE_TIMEOUT=0, ALLOWED_HOSTS=['testserver']):
+            board = Board.objects.create(name='Benchmark', description='Benchmark board')
+            password = make_password('abcdef123456')
+            User.objects.bulk_create(User(username=f'user{i}', password=password) for i in range(options['threads']))
+            starter = User.objects.first()
+            Topic.objects.bulk_create(Topic(subject=f'Topic {i}', board=board, starter=starter) for i in range(20))
+            urls = [reverse('home'), reverse('board_topics', kwargs={'pk': board.pk})]
+
+            for label, hasher in HASHERS:
+                if hasher is None:
+                    latencies, statuses, elapsed = self.run_burst(urls, 0, 0, options['reads'])
+                else:
+                    with override_settings(PASSWORD_HASHERS=[hasher]):
+                        latencies, statuses, elapsed = self.run_burst(urls, options['threads'], options['logins'])
+                latencies.sort()
+                self.stdout.write(
+                    f'{label:>14}: reads p50 {statistics.median(latencies):6.1f} ms  '
+                    f'p95 {latencies[int(len(latencies) * 0.95)]:6.1f} ms  max {latencies[-1]:6.1f} ms  '
+                    f'({len(latencies)} reads)   '
+                    f'logins {statuses[302] / elapsed:5.1f}/sec  503s {statuses[503]}  errors {sum(statuses.values()) - statuses[302] - statuses[503]}'
+                )
+
+    def run_burst(self, urls, num_threads, logins_per_thread, reads=None):
+        statuses = Counter()
+        statuses_lock = threading.Lock()
+        latencies = []
+        done = threading.Event()
+        start_line = threading.Barrier(num_threads + 1)
+
+        def login(number):
+            client = Client()
+            start_line.wait()
+            try:
+                for _ in range(logins_per_thread):
+                    response = client.post(reverse('login'), {'username': f'user{number}', 'password': 'abcdef123456'})
+                    with statuses_lock:
+                        statuses[response.status_code] += 1
+                    client.logout()
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=login, args=(i,)) for i in range(num_threads)]
+        for thread in threads:
+            thread.start()
+        start_line.wait()
+        start = time.perf_counter()
+
+        def wait_for_logins():
+            for thread in threads:
+                thread.join()
+            done.set()
+        waiter = threading.Thread(target=wait_for_logins)
+        waiter.start()
+
+        # Read from this thread until the logins are over
+        reader = Client()
+        while not done.is_set() or (reads is not None and len(latencies) < reads):
+            read_start = time.perf_counter()
+            reader.get(urls[len(latencies) % len(urls)])
+            latencies.append((time.perf_counter() - read_start) * 1000)
+        waiter.join()
+        return latencies, statuses, time.perf_counter() - start
@@ -0,0 +1,71 @@
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.shortcuts import reverse
+
+from maker_board.benchmark import benchmark_database
+
+from ...cache import purge_pages
+from ...models import Board, Topic, Post
+from ...writes import GroupCommitter, NewTopic, create_topic
+
+
+def autocommit_topic(board, starter, subject, message):
+    '''
+    The write path before it was made atomic: every statement is its own transaction
+    '''
+    topic = Topic.objects.create(subject=subject, board=board, starter=starter)
+    Post.objects.create(message=message, topic=topic, created_by=starter)
+    purge_pages(reverse('board_topics', kwargs={'pk': board.pk}), reverse('home'))
+
+
+class Command(BaseCommand):
+    help = 'Measures new topics per second from concurrent writers for each write path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--topics', type=int, default=50, help='Topics written by each thread')
+        parser.add_argument('--window', type=float, default=0.005, help='Group commit window in seconds')
+
+    def handle(self, *args, **options):
+        with benchmark_database(on_disk=True):
+            board = Board.objects.create(name='Benchmark', description='Benchmark board')
+            user = User.objects.create_user(username='bench')
+            committer = GroupCommitter(window=options['window'], max_batch=options['threads'] * 4)
+            modes = [
+                ('autocommit', autocommit_topic),
+                ('atomic', create_topic),
+                ('group commit', lambda *submission: committer.submit(NewTopic(*submission))),
+            ]
+
+            for label, write in modes:
+                rate, errors = self.run_writers(write, board, user, options['threads'], options['topics'])
+                self.stdout.write(f'{label:>12}: {rate:8.1f} topics/sec   {errors} errors')
+
+    def run_writers(self, write, board, user, num_threads, topics_per_thread):
+        errors = []
+        start_line = threading.Barrier(num_threads + 1)
+
+        def writer(number):
+            start_line.wait()
+            try:
+                for i in range(topics_per_thread):
+                    try:
+                        write(board, user, f'Topic {number}-{i}', 'Benchmark message')
+                    except Exception as e:
+                        errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(num_threads)]
+        for thread in threads:
+            thread.start()
+        start_line.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        return (num_threads * topics_per_thread - len(errors)) / elapsed, len(errors)
@@ -0,0 +1,74 @@
+import glob
+import os
+import pstats
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def read_collapsed(path):
+    stacks = Counter()
+    with open(path) as f:
+        for line in f:
+            stack, _, count = line.rstrip('\n').rpartition(' ')
+            if stack:
+                stacks[stack] += int(count)
+    return stacks
+
+
+class Command(BaseCommand):
+    help = 'Merges profiles written by SamplingProfilerMiddleware into one flame-graph-ready report'
+
+    def add_arguments(self, parser):
+        parser.add_argument('url_names', nargs='*', help='Only merge profiles for these URL names')
+        parser.add_argument('--dir', default=getattr(settings, 'PROFILER_DIR', None),
+                            help='Directory the profiles were written to')
+        parser.add_argument('--output', default='merged.collapsed',
+                            help='Collapsed-stack file to write, one root frame per URL name')
+        parser.add_argument('--top', type=int, default=15, help='Number of hottest frames to list per URL name')
+
+    def handle(self, *args, **options):
+        directory = options['dir']
+        if not directory or not os.path.isdir(directory):
+            raise CommandError(f'No profiles found in {directory!r}')
+
+        url_names = options['url_names'] or sorted(
+            name for name in os.listdir(directory) if os.path.isdir(os.path.join(directory, name))
+        )
+
+        merged = Counter()
+        for url_name in url_names:
+            collapsed_files = glob.glob(os.path.join(directory, url_name, '*.collapsed'))
+            pstats_files = glob.glob(os.path.join(directory, url_name, '*.pstats'))
+
+            stacks = Counter()
+            for path in collapsed_files:
+                stacks.update(read_collapsed(path))
+            for stack, count in stacks.items():
+                merged[f'{url_name};{stack}'] += count
+
+            self.stdout.write(self.style.MIGRATE_HEADING(url_name))
+            self.stdout.write(f'  {len(collapsed_files)} sampled profiles, {sum(stacks.values())} samples')
+            self.write_hottest(stacks, options['top'])
+
+            if pstats_files:
+                self.stdout.write(f'  {len(pstats_files)} pstats profiles')
+                stats = pstats.Stats(*pstats_files, stream=self.stdout)
+                stats.sort_stats('cumulative').print_stats(options['top'])
+
+        with open(options['output'], 'w') as f:
+            for stack, count in merged.most_common():
+                f.write(f'{stack} {count}\n')
+        self.stdout.write(self.style.SUCCESS(f'Wrote {len(merged)} stacks to {options["output"]}'))
+
+    def write_hottest(self, stacks, top):
+        '''
+        Self samples per frame, i.e. how often the frame was the leaf of a sampled stack
+        '''
+        total = sum(stacks.values())
+        leaves = Counter()
+        for stack, count in stacks.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+        for frame, count in leaves.most_common(top):
+            self.stdout.write(f'  {100 * count / total:5.1f}%  {frame}')
@@ -0,0 +1,113 @@
+import json
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in a fresh interpreter, so nothing is imported yet when the clock starts.
+# Each AppConfig's ready() is timed by wrapping it as the registry creates it.
+COLD_START_SCRIPT = '''
+import json
+import sys
+import time
+
+import django
+from django.apps.config import AppConfig
+
+ready_times = {}
+create = AppConfig.create.__func__
+
+def timed_create(cls, entry):
+    app_config = create(cls, entry)
+    ready = app_config.ready
+
+    def timed_ready():
+        start = time.perf_counter()
+        ready()
+        ready_times[app_config.label] = time.perf_counter() - start
+
+    app_config.ready = timed_ready
+    return app_config
+
+AppConfig.create = classmethod(timed_create)
+
+phases = []
+
+def phase(name, func):
+    start = time.perf_counter()
+    func()
+    phases.append((name, time.perf_counter() - start))
+
+from django.conf import settings
+phase('settings', lambda: settings.INSTALLED_APPS)
+phase('app registry', django.setup)
+
+from django.urls import get_resolver, resolve, reverse
+
+def first_request():
+    for path in sys.argv[1:]:
+        resolve(path)
+    # Every page reverses the navigation links in base.html
+    for name in ['home', 'login', 'logout', 'signup']:
+        reverse(name)
+
+phase('root URLconf', lambda: get_resolver().url_patterns)
+phase('first request URLs', first_request)
+print(json.dumps({'phases': phases, 'ready': ready_times}))
+'''
+
+# python -X importtime: "import time: self [us] | cumulative | imported package"
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)$')
+
+
+class Command(BaseCommand):
+    help = 'Reports where a cold worker spends its time before it can serve home and board_topics'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='Cold starts to run, the fastest is reported')
+        parser.add_argument('--top', type=int, default=15, help='Slowest modules and packages to list')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='URL resolved as the first request, default / and /boards/1/')
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or ['/', '/boards/1/']
+        runs = [self.cold_start(paths) for _ in range(max(options['runs'], 1))]
+        phases, ready_times, modules = min(runs, key=lambda run: sum(elapsed for _, elapsed in run[0]))
+
+        self.stdout.write(f'Cold start, fastest of {len(runs)} runs')
+        for name, elapsed in phases:
+            self.stdout.write(f'  {name:<20} {elapsed * 1000:8.1f} ms')
+        self.stdout.write(f'  {"total":<20} {sum(elapsed for _, elapsed in phases) * 1000:8.1f} ms')
+
+        self.stdout.write('\nAppConfig.ready()')
+        for label, elapsed in sorted(ready_times.items(), key=lambda item: -item[1]):
+            self.stdout.write(f'  {label:<20} {elapsed * 1000:8.1f} ms')
+
+        packages = defaultdict(int)
+        for name, self_us, _ in modules:
+            packages['.'.join(name.split('.')[:2])] += self_us
+        self.stdout.write(f'\nImport time by package ({len(modules)} modules imported)')
+        for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f'  {package:<40} {self_us / 1000:8.1f} ms')
+
+        self.stdout.write('\nSlowest modules, including their imports')
+        for name, _, cumulative_us in sorted(modules, key=lambda module: -module[2])[:options['top']]:
+            self.stdout.write(f'  {name:<40} {cumulative_us / 1000:8.1f} ms')
+
+    def cold_start(self, paths):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', COLD_START_SCRIPT, *paths],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True
+        )
+        if result.returncode:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        modules = []
+        for line in result.stderr.splitlines():
+            match = IMPORT_TIME_LINE.match(line)
+            if match:
+                modules.append((match.group(3), int(match.group(1)), int(match.group(2))))
+        return report['phases'], report['ready'], modules
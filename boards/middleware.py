@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import Resolver404, resolve
+
+from .cache import SingleFlight, page_cache_key
+
+
+class AnonymousPageCacheMiddleware:
+    '''
+    Serves whole responses from the cache to logged-out GET requests for the
+    views named in `PAGE_CACHE_URL_NAMES`. Must come after
+    `AuthenticationMiddleware`.
+
+    Responses are only stored when they are plain 200s that set no cookies and
+    did not need a CSRF token, so a form page is never shared between readers.
+    Requests it may store are marked with `request.page_cacheable`, so that
+    views render them whole instead of streaming them: a stored page is held
+    in memory in full anyway, and concurrent misses only wait for the first
+    one to be stored if it is complete when the view returns.
+    '''
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.timeout = getattr(settings, 'PAGE_CACHE_TIMEOUT', 0)
+        self.url_names = set(getattr(settings, 'PAGE_CACHE_URL_NAMES', ()))
+        self.flight = SingleFlight()
+
+    def __call__(self, request):
+        if not self.is_cacheable_request(request):
+            return self.get_response(request)
+
+        key = page_cache_key(request)
+        response = cache.get(key)
+        if response is not None:
+            response['X-Page-Cache'] = 'hit'
+            return response
+
+        return self.flight.do(key, lambda: self.render(request, key), lambda: cache.get(key))
+
+    def is_cacheable_request(self, request):
+        if not self.timeout or request.method not in ('GET', 'HEAD'):
+            return False
+        if request.user.is_authenticated:
+            return False
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return False
+        if match.url_name not in self.url_names:
+            return False
+        request.resolver_match = match
+        request.page_cacheable = True
+        return True
+
+    def render(self, request, key):
+        response = self.get_response(request)
+        if self.is_cacheable_response(request, response):
+            cache.set(key, response, self.timeout)
+            response['X-Page-Cache'] = 'miss'
+        return response
+
+    def is_cacheable_response(self, request, response):
+        return (
+            response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+            and not request.META.get('CSRF_COOKIE_USED')
+        )
@@ -0,0 +1,42 @@
+# Generated by Django 2.2.28 on 2026-10-19 11:33
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def backfill_hot_scores(apps, schema_editor):
+    from boards.ranking import hot_score
+
+    Topic = apps.get_model('boards', 'Topic')
+    topics = Topic.objects.annotate(num_posts=Count('posts'), last_post=Max('posts__created_at'))
+    for topic in topics.iterator():
+        last_activity = topic.last_post or topic.last_updated
+        Topic.objects.filter(pk=topic.pk).update(
+            post_count=topic.num_posts,
+            hot_score=hot_score(topic.num_posts, last_activity),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='topic',
+            name='hot_score',
+            field=models.FloatField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='topic',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='topic',
+            index=models.Index(fields=['board', '-hot_score'], name='topic_board_hot_idx'),
+        ),
+        migrations.RunPython(backfill_hot_scores, migrations.RunPython.noop),
+    ]
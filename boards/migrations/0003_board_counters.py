@@ -0,0 +1,38 @@
+# Generated by Django 2.2.28 on 2026-10-19 11:35
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Board = apps.get_model('boards', 'Board')
+    Topic = apps.get_model('boards', 'Topic')
+    Post = apps.get_model('boards', 'Post')
+    topics = Topic.objects.filter(board=OuterRef('pk')).order_by().values('board').annotate(count=Count('pk'))
+    posts = Post.objects.filter(topic__board=OuterRef('pk')).order_by().values('topic__board').annotate(count=Count('pk'))
+    Board.objects.update(
+        topic_count=Coalesce(Subquery(topics.values('count')), 0),
+        post_count=Coalesce(Subquery(posts.values('count')), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0002_topic_hot_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='topic_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
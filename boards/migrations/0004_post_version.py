@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-19 11:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0003_board_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
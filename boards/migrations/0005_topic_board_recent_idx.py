@@ -0,0 +1,17 @@
+# Generated by Django 2.2.28 on 2026-10-19 11:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0004_post_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='topic',
+            index=models.Index(fields=['board', '-last_updated', '-id'], name='topic_board_recent_idx'),
+        ),
+    ]
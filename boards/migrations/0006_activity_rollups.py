@@ -0,0 +1,53 @@
+# Generated by Django 2.2.28 on 2026-10-19 11:56
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('boards', '0005_topic_board_recent_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserActivity',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('post_count', models.PositiveIntegerField(default=0)),
+                ('topic_count', models.PositiveIntegerField(default=0)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='boards.Board')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='BoardActivity',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('post_count', models.PositiveIntegerField(default=0)),
+                ('topic_count', models.PositiveIntegerField(default=0)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity', to='boards.Board')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='useractivity',
+            index=models.Index(fields=['board', 'day'], name='useractivity_board_day_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useractivity',
+            index=models.Index(fields=['day'], name='useractivity_day_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='useractivity',
+            unique_together={('user', 'board', 'day')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='boardactivity',
+            unique_together={('board', 'day')},
+        ),
+    ]
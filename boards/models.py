@@ -4,12 +4,32 @@ from django.contrib.auth.models import User
 class Board(models.Model):
     name = models.CharField(max_length=30, unique=True)
     description = models.CharField(max_length=100)
+    topic_count = models.PositiveIntegerField(default=0)
+    post_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return self.name
 
 class Topic(models.Model):
     subject = models.CharField(max_length=255)
     last_updated = models.DateTimeField(auto_now_add=True)
     board = models.ForeignKey(Board, related_name='topics', on_delete=models.CASCADE)
     starter = models.ForeignKey(User, related_name='topics', on_delete=models.CASCADE)
+    post_count = models.PositiveIntegerField(default=0)
+    hot_score = models.FloatField(default=0, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', '-hot_score'], name='topic_board_hot_idx'),
+            models.Index(fields=['board', '-last_updated', '-id'], name='topic_board_recent_idx'),
+        ]
+
+    def __str__(self):
+        return self.subject
+
+    @property
+    def replies(self):
+        return max(self.post_count - 1, 0)
 
 class Post(models.Model):
     message = models.TextField(max_length=4000)
@@ -17,4 +37,37 @@ class Post(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(null=True)
     created_by = models.ForeignKey(User, related_name='posts', on_delete=models.CASCADE)
-    updated_by = models.ForeignKey(User, null=True, related_name='+', on_delete=models.CASCADE)
\ No newline at end of file
+    updated_by = models.ForeignKey(User, null=True, related_name='+', on_delete=models.CASCADE)
+    version = models.PositiveIntegerField(default=1)
+
+class UserActivity(models.Model):
+    '''
+    Posts and topics one user wrote on one board on one day. Rollup
+    maintained by boards/stats.py, never written by hand.
+    '''
+    user = models.ForeignKey(User, related_name='+', on_delete=models.CASCADE)
+    board = models.ForeignKey(Board, related_name='+', on_delete=models.CASCADE)
+    day = models.DateField()
+    post_count = models.PositiveIntegerField(default=0)
+    topic_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = [('user', 'board', 'day')]
+        indexes = [
+            models.Index(fields=['board', 'day'], name='useractivity_board_day_idx'),
+            models.Index(fields=['day'], name='useractivity_day_idx'),
+        ]
+
+
+class BoardActivity(models.Model):
+    '''
+    Posts and topics written on one board on one day. Rollup maintained by
+    boards/stats.py, never written by hand.
+    '''
+    board = models.ForeignKey(Board, related_name='activity', on_delete=models.CASCADE)
+    day = models.DateField()
+    post_count = models.PositiveIntegerField(default=0)
+    topic_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = [('board', 'day')]
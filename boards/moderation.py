@@ -0,0 +1,112 @@
+"""
+Set-based bulk moderation.
+
+Each operation walks the matching primary keys in chunks and issues one
+`UPDATE` or `DELETE` per table per chunk inside its own transaction, so a
+spam wave of thousands of topics is never loaded into memory and no single
+transaction holds the database for long. Denormalized counters are
+recomputed once for the affected rows when the whole operation is done; the
+activity rollups are adjusted chunk by chunk, in the same transactions.
+
+Deletes bypass Django's cascade collector, so no delete signals are sent.
+"""
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.shortcuts import reverse
+
+from .cache import purge_pages
+from .models import Board, Topic, Post
+from .ranking import hot_score
+from .stats import apply_activity, post_activity
+
+CHUNK_SIZE = 1000
+
+
+def chunked_pks(queryset, chunk_size=CHUNK_SIZE):
+    '''
+    Keyset pagination over primary keys, safe to use while the rows are deleted or moved
+    '''
+    last_pk = 0
+    while True:
+        pks = list(
+            queryset.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:chunk_size]
+        )
+        if not pks:
+            return
+        yield pks
+        last_pk = pks[-1]
+
+
+def chunked(values, chunk_size=CHUNK_SIZE):
+    values = sorted(values)
+    for i in range(0, len(values), chunk_size):
+        yield values[i:i + chunk_size]
+
+
+def count_subquery(queryset, field):
+    counts = queryset.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(count=Count('pk'))
+    return Coalesce(Subquery(counts.values('count')), 0)
+
+
+def recount_boards(board_ids):
+    for pks in chunked(board_ids):
+        Board.objects.filter(pk__in=pks).update(
+            topic_count=count_subquery(Topic.objects.all(), 'board'),
+            post_count=count_subquery(Post.objects.all(), 'topic__board'),
+        )
+    purge_pages(reverse('home'), *(reverse('board_topics', kwargs={'pk': pk}) for pk in board_ids))
+
+
+def recount_topics(topic_ids):
+    '''
+    Recomputes post_count and, since it depends on the count, hot_score
+    '''
+    for pks in chunked(topic_ids):
+        with transaction.atomic():
+            topics = Topic.objects.filter(pk__in=pks)
+            topics.update(post_count=count_subquery(Post.objects.all(), 'topic'))
+            scored = [
+                Topic(pk=pk, hot_score=hot_score(post_count, last_updated))
+                for pk, post_count, last_updated in topics.values_list('pk', 'post_count', 'last_updated')
+            ]
+            Topic.objects.bulk_update(scored, ['hot_score'])
+
+
+def move_topics(queryset, board, chunk_size=CHUNK_SIZE):
+    board_ids = set(queryset.order_by().values_list('board_id', flat=True).distinct())
+    board_ids.add(board.pk)
+    moved = 0
+    for pks in chunked_pks(queryset.exclude(board=board), chunk_size):
+        with transaction.atomic():
+            posts = Post.objects.filter(topic_id__in=pks)
+            apply_activity(post_activity(posts), sign=-1)
+            moved += Topic.objects.filter(pk__in=pks).update(board=board)
+            apply_activity(post_activity(posts))
+    recount_boards(board_ids)
+    return moved
+
+
+def delete_topics(queryset, chunk_size=CHUNK_SIZE):
+    board_ids = set(queryset.order_by().values_list('board_id', flat=True).distinct())
+    deleted = 0
+    for pks in chunked_pks(queryset, chunk_size):
+        with transaction.atomic():
+            apply_activity(post_activity(Post.objects.filter(topic_id__in=pks)), sign=-1)
+            Post.objects.filter(topic_id__in=pks)._raw_delete(DEFAULT_DB_ALIAS)
+            deleted += Topic.objects.filter(pk__in=pks)._raw_delete(DEFAULT_DB_ALIAS)
+    recount_boards(board_ids)
+    return deleted
+
+
+def delete_posts(queryset, chunk_size=CHUNK_SIZE):
+    topic_ids = set(queryset.order_by().values_list('topic_id', flat=True).distinct())
+    board_ids = set(queryset.order_by().values_list('topic__board_id', flat=True).distinct())
+    deleted = 0
+    for pks in chunked_pks(queryset, chunk_size):
+        with transaction.atomic():
+            apply_activity(post_activity(Post.objects.filter(pk__in=pks)), sign=-1)
+            deleted += Post.objects.filter(pk__in=pks)._raw_delete(DEFAULT_DB_ALIAS)
+    recount_topics(topic_ids)
+    recount_boards(board_ids)
+    return deleted
@@ -0,0 +1,46 @@
+"""
+Time-decayed "hot" ranking for topics.
+
+A topic's score is `log10(posts) + last_activity / HOT_TOPIC_DECAY`. The
+timestamp term grows by one every HOT_TOPIC_DECAY seconds, so a topic needs
+ten times the posts to stay level with one that was active HOT_TOPIC_DECAY
+seconds later. Because time is part of the score instead of an age penalty,
+stored scores never go stale and only need updating when a topic gets a post;
+trending lists are an index scan on `Topic.hot_score`.
+"""
+import math
+from datetime import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Topic
+
+EPOCH = datetime(2019, 7, 1, tzinfo=timezone.utc)
+
+
+def hot_score(post_count, last_activity):
+    decay = getattr(settings, 'HOT_TOPIC_DECAY', 45000)
+    seconds = (last_activity - EPOCH).total_seconds()
+    return math.log10(max(post_count, 1)) + seconds / decay
+
+
+def record_post(topic, created_at):
+    '''
+    Count a new post on an existing topic and move it up the hot list. Called
+    by boards.writes.create_reply, inside its transaction.
+    '''
+    topics = Topic.objects.filter(pk=topic.pk)
+    with transaction.atomic():
+        # The increment locks the row (the whole database on SQLite) until
+        # commit, so the count read back is the one this call wrote
+        topics.update(post_count=F('post_count') + 1, last_updated=created_at)
+        post_count = topics.values_list('post_count', flat=True).get()
+        score = hot_score(post_count, created_at)
+        topics.update(hot_score=score)
+
+    topic.post_count = post_count
+    topic.hot_score = score
+    topic.last_updated = created_at
@@ -0,0 +1,170 @@
+"""
+Activity rollups: posts and topics per user, board and day.
+
+`UserActivity` and `BoardActivity` are kept up to date by the write paths
+(new topics in boards/writes.py, moves and deletes in boards/moderation.py)
+inside the same transactions as the posts themselves, so the stats pages
+only ever read these small tables. Any new code path that creates posts
+has to call `record_activity` too.
+
+`backfill_activity` rebuilds both tables from the posts table; run it once
+after migrating, and after any bulk change made outside these paths.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+from .models import BoardActivity, Post, UserActivity
+
+ROLLUPS = [UserActivity, BoardActivity]
+
+
+def record_activity(entries):
+    '''
+    Counts posts given as (user_id, board_id, created_at, started_topic) tuples
+    '''
+    activity = defaultdict(lambda: [0, 0])
+    for user_id, board_id, created_at, started_topic in entries:
+        counts = activity[user_id, board_id, timezone.localdate(created_at)]
+        counts[0] += 1
+        counts[1] += int(started_topic)
+    apply_activity(activity)
+
+
+def post_activity(posts):
+    '''
+    Activity of the posts in `posts`, aggregated in the database. A post
+    started its topic when it is the topic's first post.
+    '''
+    first_post = Post.objects.filter(topic=OuterRef('topic')).order_by('pk').values('pk')[:1]
+    rows = posts.order_by().annotate(day=TruncDate('created_at')).values(
+        'created_by_id', 'topic__board_id', 'day'
+    ).annotate(
+        posts=Count('pk'),
+        topics=Count('pk', filter=Q(pk=Subquery(first_post, output_field=IntegerField())))
+    )
+    return {
+        (row['created_by_id'], row['topic__board_id'], row['day']): [row['posts'], row['topics']]
+        for row in rows
+    }
+
+
+def apply_activity(activity, sign=1):
+    '''
+    Adds (or with `sign=-1` takes away) activity keyed by (user_id, board_id, day)
+    '''
+    per_board = defaultdict(lambda: [0, 0])
+    for (user_id, board_id, day), (posts, topics) in activity.items():
+        increment(UserActivity, {'user_id': user_id, 'board_id': board_id, 'day': day}, posts * sign, topics * sign)
+        per_board[board_id, day][0] += posts
+        per_board[board_id, day][1] += topics
+    for (board_id, day), (posts, topics) in per_board.items():
+        increment(BoardActivity, {'board_id': board_id, 'day': day}, posts * sign, topics * sign)
+
+
+def increment(model, key, posts, topics):
+    '''
+    Adds to the counters of the rollup row for `key`, creating it when
+    needed. Rows are never taken below zero or created by a decrement.
+    '''
+    rows = model.objects.filter(**key)
+    if posts < 0 or topics < 0:
+        rows.update(
+            post_count=Greatest(F('post_count') + posts, Value(0)),
+            topic_count=Greatest(F('topic_count') + topics, Value(0))
+        )
+        return
+    counters = {'post_count': F('post_count') + posts, 'topic_count': F('topic_count') + topics}
+    if rows.update(**counters):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**key, post_count=posts, topic_count=topics)
+    except IntegrityError:
+        # Created by a concurrent writer since the update above
+        rows.update(**counters)
+
+
+def backfill_activity(chunk_size=1000, progress=None):
+    '''
+    Rebuilds the rollups from all posts, one chunk of posts per transaction.
+    Posts written while it runs are counted by their write path.
+    '''
+    from .moderation import chunked_pks
+
+    with transaction.atomic():
+        for model in ROLLUPS:
+            model.objects.all().delete()
+        # Read in the same transaction as the deletes: a post committed
+        # before it is counted by the backfill below, one committed after it
+        # by its own write path against the emptied tables
+        last_pk = Post.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+
+    done = 0
+    for pks in chunked_pks(Post.objects.filter(pk__lte=last_pk), chunk_size):
+        with transaction.atomic():
+            apply_activity(post_activity(Post.objects.filter(pk__in=pks)))
+        done += len(pks)
+        if progress is not None:
+            progress(done)
+    return done
+
+
+def day_range(days):
+    end = timezone.localdate()
+    return end - timedelta(days=days - 1), end
+
+
+def board_activity(board, start, end):
+    '''
+    Posts, topics and active users for each day from `start` to `end`, with
+    days without activity included
+    '''
+    totals = {
+        row['day']: row for row in
+        BoardActivity.objects.filter(board=board, day__range=(start, end)).values('day', 'post_count', 'topic_count')
+    }
+    active = dict(
+        UserActivity.objects.filter(board=board, day__range=(start, end), post_count__gt=0)
+        .values('day').annotate(users=Count('user_id')).values_list('day', 'users')
+    )
+    days = []
+    day = start
+    while day <= end:
+        row = totals.get(day, {})
+        days.append({
+            'day': day,
+            'post_count': row.get('post_count', 0),
+            'topic_count': row.get('topic_count', 0),
+            'active_users': active.get(day, 0),
+        })
+        day += timedelta(days=1)
+    return days
+
+
+def active_user_count(board, start, end):
+    return UserActivity.objects.filter(
+        board=board, day__range=(start, end), post_count__gt=0
+    ).values('user_id').distinct().count()
+
+
+def top_makers(start, end, board=None, limit=10):
+    '''
+    Users with the most posts from `start` to `end`, with user_id,
+    post_count and topic_count attributes
+    '''
+    activity = UserActivity.objects.filter(day__range=(start, end))
+    if board is not None:
+        activity = activity.filter(board=board)
+    rows = activity.values('user_id').annotate(
+        posts=Sum('post_count'), topics=Sum('topic_count')
+    ).filter(posts__gt=0).order_by('-posts', 'user_id')[:limit]
+    return [
+        SimpleNamespace(user_id=row['user_id'], post_count=row['posts'], topic_count=row['topics'])
+        for row in rows
+    ]
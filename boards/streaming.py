@@ -0,0 +1,64 @@
+"""
+Streamed rendering for long listing pages.
+
+The page template marks where its rows go with `{% block rows %}`. The page
+is rendered once with a marker in that block and split around it: everything
+before the rows (head, navbar, breadcrumb, table header) is sent straight
+away, then the rows are rendered in batches as the query yields them, then
+the rest of the page. Neither the row objects nor the markup for all of them
+is ever held in memory at once.
+"""
+import uuid
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.template import engines
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+ROWS_MARKER = mark_safe(f'<!-- rows {uuid.uuid4().hex} -->')
+
+_page_templates = {}
+
+
+def page_template(template_name):
+    '''
+    `template_name` with its rows block replaced by the marker
+    '''
+    template = _page_templates.get(template_name)
+    if template is None:
+        template = _page_templates[template_name] = engines['django'].from_string(
+            f'{{% extends "{template_name}" %}}{{% block rows %}}{{{{ rows_marker }}}}{{% endblock %}}'
+        )
+    return template
+
+
+def stream_listing(request, template_name, context, rows_template_name, rows_name, rows, prepare=None,
+                   batch_size=None):
+    '''
+    Streams `template_name` with `rows` rendered through `rows_template_name`
+    in batches, each passed to the rows template as `rows_name`. `prepare` is
+    called on every batch before it is rendered.
+    '''
+    batch_size = batch_size or getattr(settings, 'STREAMING_BATCH_SIZE', 200)
+    head, tail = page_template(template_name).render({**context, 'rows_marker': ROWS_MARKER}, request).split(ROWS_MARKER)
+    rows_template = get_template(rows_template_name)
+
+    def render_batch(batch):
+        if prepare is not None:
+            batch = prepare(batch)
+        return rows_template.render({rows_name: batch})
+
+    def content():
+        yield head
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) == batch_size:
+                yield render_batch(batch)
+                batch = []
+        if batch:
+            yield render_batch(batch)
+        yield tail
+
+    return StreamingHttpResponse(content())
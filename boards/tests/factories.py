@@ -0,0 +1,31 @@
+from ..models import Board, Post, Topic
+
+
+def make_boards(*names):
+    '''
+    Boards named `names`, in that order, created with one INSERT
+    '''
+    Board.objects.bulk_create(Board(name=name, description=f'{name} Board.') for name in names)
+    # bulk_create leaves the primary keys unset on SQLite
+    boards = Board.objects.in_bulk(names, field_name='name')
+    return [boards[name] for name in names]
+
+
+def make_topics(board, starter, subjects, replied_by=None):
+    '''
+    Topics on `board` with a first post by `starter` each, and a reply by
+    `replied_by` when given, in one INSERT per table. Board counters are
+    left alone, call boards.moderation.recount_boards when a test needs them.
+    '''
+    post_count = 1 if replied_by is None else 2
+    Topic.objects.bulk_create(
+        Topic(subject=subject, board=board, starter=starter, post_count=post_count) for subject in subjects
+    )
+    topics = list(board.topics.order_by('-pk')[:len(subjects)])[::-1]
+    posts = []
+    for topic in topics:
+        posts.append(Post(message=f'{topic.subject} message', topic=topic, created_by=starter))
+        if replied_by is not None:
+            posts.append(Post(message='A reply', topic=topic, created_by=replied_by))
+    Post.objects.bulk_create(posts)
+    return topics
@@ -0,0 +1,117 @@
+import base64
+import json
+from datetime import timedelta
+
+from django.test import TestCase
+from django.shortcuts import reverse
+from django.utils import timezone
+
+from accounts.tests.factories import make_users
+
+from .. import api
+from ..models import Board, Topic
+from .factories import make_boards
+
+
+class ApiTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.django, cls.python = make_boards('Django', 'Python')
+        cls.user, = make_users('john')
+        now = timezone.now()
+        for board in (cls.django, cls.python):
+            Topic.objects.bulk_create(
+                Topic(subject=f'{board.name} {i}', board=board, starter=cls.user) for i in range(5)
+            )
+            # Spread the topics out in time, newest has the highest number
+            for i, topic in enumerate(board.topics.order_by('pk')):
+                Topic.objects.filter(pk=topic.pk).update(last_updated=now - timedelta(minutes=10 - i))
+
+    def assertWithinBudget(self, response, view):
+        self.assertLessEqual(int(response['X-Query-Count']), view.query_budget)
+
+
+class BoardsApiTests(ApiTestCase):
+
+    def test_boards(self):
+        response = self.client.get(reverse('api_boards'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([board['name'] for board in response.json()['results']], ['Django', 'Python'])
+        self.assertWithinBudget(response, api.boards)
+
+    def test_field_selection(self):
+        response = self.client.get(reverse('api_boards'), {'fields': 'id,name'})
+        self.assertEqual(response.json()['results'][0], {'id': self.django.pk, 'name': 'Django'})
+
+    def test_unknown_field(self):
+        response = self.client.get(reverse('api_boards'), {'fields': 'id,secret'})
+        self.assertEqual(response.status_code, 400)
+
+
+class BoardTopicsApiTests(ApiTestCase):
+
+    def test_cursor_pagination(self):
+        url = reverse('api_board_topics', kwargs={'pk': self.django.pk})
+        response = self.client.get(url, {'limit': 2, 'fields': 'subject'})
+        page = response.json()
+        self.assertEqual(page['results'], [{'subject': 'Django 4'}, {'subject': 'Django 3'}])
+        self.assertWithinBudget(response, api.board_topics)
+
+        subjects = [topic['subject'] for topic in page['results']]
+        while page['next']:
+            page = self.client.get(page['next']).json()
+            subjects += [topic['subject'] for topic in page['results']]
+        self.assertEqual(subjects, [f'Django {i}' for i in reversed(range(5))])
+
+    def test_starter_username(self):
+        url = reverse('api_board_topics', kwargs={'pk': self.django.pk})
+        response = self.client.get(url, {'fields': 'id,starter_username', 'limit': 1})
+        self.assertEqual(set(response.json()['results'][0]), {'id', 'starter_username'})
+        self.assertEqual(response.json()['results'][0]['starter_username'], 'john')
+
+    def test_invalid_cursor(self):
+        url = reverse('api_board_topics', kwargs={'pk': self.django.pk})
+        self.assertEqual(self.client.get(url, {'cursor': 'nonsense'}).status_code, 400)
+
+    def test_cursor_with_invalid_id(self):
+        url = reverse('api_board_topics', kwargs={'pk': self.django.pk})
+        cursor = base64.urlsafe_b64encode(json.dumps(['2020-01-01T00:00:00+00:00', 'abc']).encode()).decode()
+        response = self.client.get(url, {'cursor': cursor})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'Invalid cursor'})
+
+    def test_board_not_found(self):
+        url = reverse('api_board_topics', kwargs={'pk': 99})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {'error': 'Board not found'})
+
+
+class MultiBoardTopicsApiTests(ApiTestCase):
+
+    def test_topics_for_many_boards_in_one_query(self):
+        response = self.client.get(reverse('api_topics'), {
+            'boards': f'{self.django.pk},{self.python.pk}', 'limit': 3, 'fields': 'subject,last_updated'
+        })
+        self.assertEqual(response['X-Query-Count'], '1')
+        results = response.json()['results']
+        self.assertEqual([t['subject'] for t in results[str(self.python.pk)]['results']],
+                         ['Python 4', 'Python 3', 'Python 2'])
+        self.assertEqual(set(results[str(self.django.pk)]['results'][0]), {'subject', 'last_updated'})
+
+        page = self.client.get(results[str(self.django.pk)]['next']).json()
+        self.assertEqual([t['subject'] for t in page['results']], ['Django 1', 'Django 0'])
+
+    def test_board_without_topics(self):
+        empty = Board.objects.create(name='Empty', description='Nothing here.')
+        response = self.client.get(reverse('api_topics'), {'boards': str(empty.pk)})
+        self.assertEqual(response.json()['results'], {str(empty.pk): {'results': [], 'next': None}})
+
+    def test_boards_required(self):
+        self.assertEqual(self.client.get(reverse('api_topics')).status_code, 400)
+
+    def test_gzip(self):
+        url = reverse('api_board_topics', kwargs={'pk': self.django.pk})
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
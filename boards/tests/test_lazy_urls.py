@@ -0,0 +1,85 @@
+from io import StringIO
+
+from django.test import TestCase
+from django.http import HttpResponse
+from django.urls import path, resolve, reverse
+from django.core.management import call_command
+from django.core.checks import run_checks
+from django.contrib import admin
+from django.contrib.admin import AdminSite, ModelAdmin
+from django.contrib.auth.views import LoginView
+
+from maker_board.lazy_urls import LazyView, lazy_include
+
+from ..models import Board, Topic
+
+
+def view(request):
+    return HttpResponse()
+
+
+class LazyIncludeTests(TestCase):
+
+    def setUp(self):
+        self.loads = 0
+
+        def loader():
+            self.loads += 1
+            return [path('inside/', view, name='inside')]
+
+        class urls:
+            urlpatterns = [
+                path('', view, name='outside'),
+                lazy_include('lazy/', loader, namespace='lazy'),
+            ]
+        self.urls = urls
+
+    def test_other_urls_do_not_load_the_tree(self):
+        self.assertEqual(reverse('outside', urlconf=self.urls), '/')
+        self.assertEqual(resolve('/', urlconf=self.urls).url_name, 'outside')
+        self.assertEqual(self.loads, 0)
+
+    def test_resolve_loads_the_tree_once(self):
+        self.assertEqual(resolve('/lazy/inside/', urlconf=self.urls).view_name, 'lazy:inside')
+        resolve('/lazy/inside/', urlconf=self.urls)
+        self.assertEqual(self.loads, 1)
+
+    def test_reverse_loads_the_tree(self):
+        reverse('outside', urlconf=self.urls)
+        self.assertEqual(reverse('lazy:inside', urlconf=self.urls), '/lazy/inside/')
+        self.assertEqual(self.loads, 1)
+
+    def test_admin(self):
+        self.assertEqual(self.client.get(reverse('admin:index')).status_code, 302)
+
+
+class LazyViewTests(TestCase):
+
+    def test_view_set_up_on_first_request(self):
+        lazy = LazyView('django.contrib.auth.views.LoginView', template_name='accounts/login.html')
+        self.assertNotIn('view', lazy.__dict__)
+        response = lazy(self.client.get(reverse('login')).wsgi_request)
+        self.assertEqual(response.status_code, 200)
+        self.assertIs(lazy.view_class, LoginView)
+
+    def test_resolves_to_view_class(self):
+        self.assertIs(resolve('/accounts/login').func.view_class, LoginView)
+
+
+class AdminChecksTests(TestCase):
+
+    def test_registered_admins_checked(self):
+        site = AdminSite(name='broken')
+        site.register(Board, type('BrokenBoardAdmin', (ModelAdmin,), {'list_display': ['missing']}))
+        errors = run_checks(tags=['admin'])
+        self.assertIn('admin.E108', [error.id for error in errors])
+        self.assertIn(Topic, admin.site._registry)
+
+
+class StartupReportTests(TestCase):
+
+    def test_report(self):
+        out = StringIO()
+        call_command('startup_report', runs=1, top=3, stdout=out)
+        self.assertIn('first request URLs', out.getvalue())
+        self.assertIn('AppConfig.ready()', out.getvalue())
@@ -0,0 +1,115 @@
+from django.test import TestCase
+from django.shortcuts import reverse
+from django.contrib.admin import helpers
+from django.contrib.auth.models import User
+
+from accounts.tests.factories import make_users
+
+from ..models import Topic, Post
+from ..moderation import delete_posts, delete_topics, move_topics, recount_boards
+from ..ranking import hot_score
+from .factories import make_boards, make_topics
+
+
+class ModerationTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.django, cls.python = make_boards('Django', 'Python')
+        cls.ama, cls.spammer = make_users('ama', 'spammer')
+        make_topics(cls.django, cls.ama, [f'Question {i}' for i in range(5)], replied_by=cls.ama)
+        make_topics(cls.django, cls.spammer, [f'Cheap watches {i}' for i in range(25)], replied_by=cls.ama)
+        recount_boards([cls.django.pk, cls.python.pk])
+
+    def assertCounters(self, board, topics, posts):
+        board.refresh_from_db()
+        self.assertEqual((board.topic_count, board.post_count), (topics, posts))
+
+
+class MoveTopicsTests(ModerationTestCase):
+
+    def test_move_topics_in_chunks(self):
+        moved = move_topics(Topic.objects.filter(starter=self.spammer), self.python, chunk_size=7)
+        self.assertEqual(moved, 25)
+        self.assertEqual(self.python.topics.count(), 25)
+        self.assertCounters(self.django, 5, 10)
+        self.assertCounters(self.python, 25, 50)
+
+
+class DeleteTopicsTests(ModerationTestCase):
+
+    def test_delete_topics_removes_posts(self):
+        deleted = delete_topics(Topic.objects.filter(subject__startswith='Cheap'), chunk_size=7)
+        self.assertEqual(deleted, 25)
+        self.assertEqual(Topic.objects.count(), 5)
+        self.assertEqual(Post.objects.count(), 10)
+        self.assertCounters(self.django, 5, 10)
+
+    def test_delete_posts_updates_topic_counts(self):
+        deleted = delete_posts(Post.objects.filter(message='A reply', topic__starter=self.spammer), chunk_size=7)
+        self.assertEqual(deleted, 25)
+        self.assertEqual(Topic.objects.filter(starter=self.spammer, post_count=1).count(), 25)
+        self.assertCounters(self.django, 30, 35)
+
+    def test_delete_posts_rescores_topics(self):
+        delete_posts(Post.objects.filter(message='A reply', topic__starter=self.spammer))
+        for topic in Topic.objects.filter(starter=self.spammer):
+            self.assertAlmostEqual(topic.hot_score, hot_score(topic.post_count, topic.last_updated))
+
+
+class ModerationAdminTests(ModerationTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        User.objects.create_superuser(username='admin', email='admin@example.com', password='abcde12345')
+
+    def setUp(self):
+        self.client.login(username='admin', password='abcde12345')
+        self.url = reverse('admin:boards_topic_changelist')
+
+    def post_action(self, action, selected, **data):
+        return self.client.post(self.url, {
+            'action': action,
+            helpers.ACTION_CHECKBOX_NAME: [topic.pk for topic in selected],
+            **data
+        })
+
+    def test_changelist_skips_full_count(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context['cl'].show_full_result_count)
+
+    def test_default_delete_action_replaced(self):
+        response = self.client.get(self.url)
+        choices = dict(response.context['action_form'].fields['action'].choices)
+        self.assertNotIn('delete_selected', choices)
+        self.assertIn('delete_selected_fast', choices)
+
+    def test_delete_by_starter(self):
+        selected = Topic.objects.filter(starter=self.spammer)[:1]
+        self.post_action('delete_by_starter', selected)
+        self.assertFalse(Topic.objects.filter(starter=self.spammer).exists())
+        self.assertCounters(self.django, 5, 10)
+
+    def test_move_to_board_asks_for_board(self):
+        selected = Topic.objects.filter(starter=self.spammer)
+        response = self.post_action('move_to_board', selected)
+        self.assertTemplateUsed(response, 'admin/boards/action_form.html')
+        self.assertEqual(self.python.topics.count(), 0)
+
+        self.post_action('move_to_board', selected, apply='Apply', board=self.python.pk)
+        self.assertEqual(self.python.topics.count(), 25)
+
+    def test_delete_matching_pattern(self):
+        selected = Topic.objects.all()[:1]
+        self.post_action('delete_matching_pattern', selected, apply='Apply', pattern='^cheap')
+        self.assertEqual(Topic.objects.count(), 5)
+        self.assertCounters(self.django, 5, 10)
+
+    def test_delete_matching_invalid_pattern(self):
+        selected = Topic.objects.all()[:1]
+        response = self.post_action('delete_matching_pattern', selected, apply='Apply', pattern='(unclosed')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Invalid regular expression')
+        self.assertEqual(Topic.objects.count(), 30)
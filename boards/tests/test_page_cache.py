@@ -0,0 +1,147 @@
+import threading
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.http import HttpResponse
+from django.shortcuts import reverse
+from django.urls import path
+from django.core.cache import cache
+from django.middleware.csrf import get_token
+from django.contrib.auth.models import User
+
+from ..models import Board, Topic
+from ..cache import GENERATION_PREFIX, SingleFlight, purge_pages
+
+
+def token_page(request):
+    return HttpResponse(get_token(request))
+
+
+urlpatterns = [
+    path('token/', token_page, name='token_page'),
+]
+
+
+class AnonymousPageCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.board = Board.objects.create(name='Django', description='Django Board.')
+        self.user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        self.url = reverse('board_topics', kwargs={'pk': self.board.pk})
+
+    def test_second_anonymous_request_is_a_hit(self):
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+        self.assertEqual(first['X-Page-Cache'], 'miss')
+        self.assertEqual(second['X-Page-Cache'], 'hit')
+        self.assertEqual(first.content, second.content)
+
+    def test_unread_query_parameters_share_the_page(self):
+        self.client.get(self.url, {'sort': 'hot'})
+        response = self.client.get(self.url, {'sort': 'hot', 'junk': '1'})
+        self.assertEqual(response['X-Page-Cache'], 'hit')
+        self.assertEqual(self.client.get(self.url)['X-Page-Cache'], 'miss')
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.get(self.url)
+        self.client.login(username='john', password='123')
+        response = self.client.get(self.url)
+        self.assertFalse(response.has_header('X-Page-Cache'))
+        self.assertContains(response, 'john')
+
+    @override_settings(ROOT_URLCONF=__name__, PAGE_CACHE_URL_NAMES=['token_page'])
+    def test_pages_needing_csrf_token_not_cached(self):
+        '''
+        A page that uses a CSRF token must not be stored even when listed in
+        PAGE_CACHE_URL_NAMES. `token_page` is a logged-out 200 that sets no
+        cookie of its own, so only the CSRF check can keep it out.
+        '''
+        first = self.client.get('/token/')
+        response = self.client.get('/token/')
+        self.assertEqual(first.status_code, 200)
+        self.assertFalse(response.has_header('X-Page-Cache'))
+
+    def test_purge_serves_fresh_page(self):
+        self.client.get(self.url)
+        Topic.objects.create(subject='Fresh topic', board=self.board, starter=self.user)
+        self.assertNotContains(self.client.get(self.url), 'Fresh topic')
+
+        purge_pages(self.url)
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Page-Cache'], 'miss')
+        self.assertContains(response, 'Fresh topic')
+
+    def test_evicted_generation_does_not_return_purged_page(self):
+        self.client.get(self.url)
+        purge_pages(self.url)
+        self.client.get(self.url)
+        Topic.objects.create(subject='Fresh topic', board=self.board, starter=self.user)
+        purge_pages(self.url)
+        # As if the cache had culled the counter
+        cache.delete(GENERATION_PREFIX + self.url)
+        self.assertContains(self.client.get(self.url), 'Fresh topic')
+
+    def test_purge_is_targeted(self):
+        other = Board.objects.create(name='Python', description='Python Board.')
+        other_url = reverse('board_topics', kwargs={'pk': other.pk})
+        self.client.get(self.url)
+        self.client.get(other_url)
+
+        purge_pages(self.url)
+        self.assertEqual(self.client.get(self.url)['X-Page-Cache'], 'miss')
+        self.assertEqual(self.client.get(other_url)['X-Page-Cache'], 'hit')
+
+
+class NewTopicPurgeTests(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.board = Board.objects.create(name='Django', description='Django Board.')
+        self.other = Board.objects.create(name='Python', description='Python Board.')
+        User.objects.create_user(username='john', email='john@doe.com', password='123')
+
+    def test_new_topic_purges_board_and_home(self):
+        board_url = reverse('board_topics', kwargs={'pk': self.board.pk})
+        other_url = reverse('board_topics', kwargs={'pk': self.other.pk})
+        home_url = reverse('home')
+        for url in (board_url, other_url, home_url):
+            self.client.get(url)
+
+        author = self.client_class()
+        author.login(username='john', password='123')
+        author.post(reverse('new_topic', kwargs={'pk': self.board.pk}),
+                         {'subject': 'Test Title', 'message': 'Test Message'})
+
+        self.assertEqual(self.client.get(board_url)['X-Page-Cache'], 'miss')
+        self.assertEqual(self.client.get(home_url)['X-Page-Cache'], 'miss')
+        self.assertEqual(self.client.get(other_url)['X-Page-Cache'], 'hit')
+
+
+class SingleFlightTests(TestCase):
+
+    def test_concurrent_misses_run_once(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        results = {}
+        calls = []
+
+        def render():
+            calls.append(1)
+            release.wait(5)
+            results['value'] = 'page'
+            return 'page'
+
+        def request():
+            '''
+            Like the middleware, look in the cache before joining the flight
+            '''
+            return results.get('value') or flight.do('key', render, lambda: results.get('value'))
+
+        threads = [threading.Thread(target=request) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.test import TestCase
+from django.shortcuts import reverse
+from django.core.management import call_command
+from django.contrib.auth.models import User
+
+from ..models import Board
+
+
+class ProfilingTestCase(TestCase):
+
+    def setUp(self):
+        self.profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profile_dir)
+        Board.objects.create(name='Django', description='Django Board.')
+
+    def profiles(self, url_name, extension):
+        directory = os.path.join(self.profile_dir, url_name)
+        if not os.path.isdir(directory):
+            return []
+        return [name for name in os.listdir(directory) if name.endswith(extension)]
+
+
+class SampledProfilingTests(ProfilingTestCase):
+
+    def test_no_profiles_when_sampling_disabled(self):
+        with self.settings(PROFILER_DIR=self.profile_dir, PROFILER_SAMPLE_RATE=0):
+            self.client.get(reverse('home'))
+        self.assertEqual(os.listdir(self.profile_dir), [])
+
+    def test_every_request_sampled(self):
+        '''
+        A zero interval makes the sampler take samples as fast as it can,
+        so even a short request leaves a profile behind
+        '''
+        with self.settings(PROFILER_DIR=self.profile_dir, PROFILER_SAMPLE_RATE=1, PROFILER_INTERVAL=0):
+            self.client.get(reverse('board_topics', kwargs={'pk': 1}))
+        collapsed = self.profiles('board_topics', '.collapsed')
+        self.assertEqual(len(collapsed), 1)
+        with open(os.path.join(self.profile_dir, 'board_topics', collapsed[0])) as f:
+            line = f.readline()
+        stack, count = line.rsplit(' ', 1)
+        self.assertIn(';', stack)
+        self.assertGreater(int(count), 0)
+
+
+    def test_profiles_within_a_second_kept(self):
+        with self.settings(PROFILER_DIR=self.profile_dir, PROFILER_SAMPLE_RATE=1, PROFILER_INTERVAL=0):
+            self.client.get(reverse('home'))
+            self.client.get(reverse('home'))
+        self.assertEqual(len(self.profiles('home', '.collapsed')), 2)
+
+
+class StaffProfilingTests(ProfilingTestCase):
+
+    def test_anonymous_profile_flag_ignored(self):
+        with self.settings(PROFILER_DIR=self.profile_dir):
+            self.client.get(reverse('home'), {'_profile': 'pstats'})
+        self.assertEqual(os.listdir(self.profile_dir), [])
+
+    def test_staff_pstats_profile(self):
+        User.objects.create_user(username='ama', password='abcde12345', is_staff=True)
+        self.client.login(username='ama', password='abcde12345')
+        with self.settings(PROFILER_DIR=self.profile_dir):
+            self.client.get(reverse('home'), {'_profile': 'pstats'})
+        self.assertEqual(len(self.profiles('home', '.pstats')), 1)
+
+
+class MergeProfilesTests(ProfilingTestCase):
+
+    def test_merge_prefixes_stacks_with_url_name(self):
+        for url_name, stacks in [('home', 'a;b 3\na;c 1\n'), ('board_topics', 'a;b 2\n')]:
+            os.makedirs(os.path.join(self.profile_dir, url_name))
+            for i in range(2):
+                with open(os.path.join(self.profile_dir, url_name, f'{i}.collapsed'), 'w') as f:
+                    f.write(stacks)
+
+        output = os.path.join(self.profile_dir, 'merged.collapsed')
+        call_command('merge_profiles', dir=self.profile_dir, output=output, stdout=StringIO())
+        with open(output) as f:
+            merged = f.read().splitlines()
+        self.assertEqual(merged, ['home;a;b 6', 'board_topics;a;b 4', 'home;a;c 2'])
@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+from django.test import TestCase, TransactionTestCase
+from django.shortcuts import reverse
+from django.core.cache import cache
+from django.utils import timezone
+from django.contrib.auth.models import User
+
+from ..models import Board, Topic, UserActivity
+from ..ranking import hot_score, record_post
+from ..writes import create_reply, create_topic
+from .utils import FileDatabaseMixin, run_concurrently
+
+
+class HotScoreTests(TestCase):
+
+    def test_more_posts_rank_higher(self):
+        now = timezone.now()
+        self.assertGreater(hot_score(10, now), hot_score(1, now))
+
+    def test_recent_activity_ranks_higher(self):
+        now = timezone.now()
+        self.assertGreater(hot_score(1, now), hot_score(1, now - timedelta(hours=1)))
+
+    def test_decay_period_worth_ten_times_the_posts(self):
+        now = timezone.now()
+        with self.settings(HOT_TOPIC_DECAY=3600):
+            self.assertAlmostEqual(hot_score(10, now - timedelta(hours=1)), hot_score(1, now))
+
+
+class CreateReplyTests(TestCase):
+
+    def setUp(self):
+        self.board = Board.objects.create(name='Django', description='Django Board.')
+        self.user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        self.topic = create_topic(self.board, self.user, 'Hello', 'First post')
+
+    def test_reply_updates_count_and_score(self):
+        post = create_reply(self.topic, self.user, 'A reply')
+        self.topic.refresh_from_db()
+        self.assertEqual(self.topic.post_count, 2)
+        self.assertEqual(self.topic.replies, 1)
+        self.assertEqual(self.topic.last_updated, post.created_at)
+        self.assertAlmostEqual(self.topic.hot_score, hot_score(2, post.created_at))
+
+    def test_reply_updates_board_and_activity(self):
+        create_reply(self.topic, self.user, 'A reply')
+        self.board.refresh_from_db()
+        self.assertEqual((self.board.topic_count, self.board.post_count), (1, 2))
+        self.assertEqual(UserActivity.objects.get(user=self.user, board=self.board).post_count, 2)
+
+    def test_replied_topic_moves_up(self):
+        newer = create_topic(self.board, self.user, 'Newer', 'First post')
+        self.assertEqual(Topic.objects.order_by('-hot_score').first(), newer)
+        create_reply(self.topic, self.user, 'A reply')
+        self.assertEqual(Topic.objects.order_by('-hot_score').first(), self.topic)
+
+
+class ConcurrentRecordPostTests(FileDatabaseMixin, TransactionTestCase):
+
+    def test_concurrent_posts_all_counted(self):
+        board = Board.objects.create(name='Django', description='Django Board.')
+        user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        topic = create_topic(board, user, 'Hello', 'First post')
+        writers, posts = 4, 5
+
+        def writer():
+            for _ in range(posts):
+                record_post(Topic.objects.get(pk=topic.pk), timezone.now())
+
+        self.assertEqual(run_concurrently(writer, [()] * writers), [])
+        topic.refresh_from_db()
+        self.assertEqual(topic.post_count, 1 + writers * posts)
+        self.assertAlmostEqual(topic.hot_score, hot_score(topic.post_count, topic.last_updated))
+
+
+class TrendingTopicsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.board = Board.objects.create(name='Django', description='Django Board.')
+        user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        now = timezone.now()
+        Topic.objects.create(subject='Old and busy', board=self.board, starter=user,
+                             post_count=50, hot_score=hot_score(50, now - timedelta(days=2)))
+        Topic.objects.create(subject='New and quiet', board=self.board, starter=user,
+                             post_count=1, hot_score=hot_score(1, now))
+
+    def test_board_topics_trending_order(self):
+        url = reverse('board_topics', kwargs={'pk': self.board.pk})
+        response = self.client.get(url, {'sort': 'hot'})
+        subjects = [topic.subject for topic in response.context['topics']]
+        self.assertEqual(subjects, ['New and quiet', 'Old and busy'])
+
+    def test_home_contains_hot_topics(self):
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, 'Trending topics')
+        self.assertContains(response, 'Old and busy')
+
+    def test_new_topic_gets_hot_score(self):
+        self.client.login(username='john', password='123')
+        self.client.post(reverse('new_topic', kwargs={'pk': self.board.pk}),
+                         {'subject': 'Brand new', 'message': 'Test Message'})
+        topic = Topic.objects.get(subject='Brand new')
+        self.assertEqual(topic.post_count, 1)
+        self.assertEqual(Topic.objects.order_by('-hot_score').first(), topic)
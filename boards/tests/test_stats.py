@@ -0,0 +1,121 @@
+from io import StringIO
+
+from django.test import TestCase
+from django.shortcuts import reverse
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.tests.factories import make_users
+
+from ..models import BoardActivity, Topic, Post, UserActivity
+from ..moderation import delete_topics, move_topics
+from ..stats import backfill_activity, record_activity
+from ..writes import create_topic
+from .factories import make_boards
+
+
+class StatsTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.django, cls.python = make_boards('Django', 'Python')
+        cls.ama, cls.john = make_users('ama', 'john')
+
+    def setUp(self):
+        self.today = timezone.localdate()
+
+    @classmethod
+    def reply(cls, topic, user):
+        post = Post.objects.create(message='A reply', topic=topic, created_by=user)
+        record_activity([(user.pk, topic.board_id, post.created_at, False)])
+        return post
+
+    def rollups(self):
+        users = set(UserActivity.objects.values_list('user_id', 'board_id', 'day', 'post_count', 'topic_count'))
+        boards = set(BoardActivity.objects.values_list('board_id', 'day', 'post_count', 'topic_count'))
+        return users, boards
+
+
+class IncrementalRollupTests(StatsTestCase):
+
+    def test_new_topics_and_replies(self):
+        topic = create_topic(self.django, self.ama, 'Hello', 'First post')
+        create_topic(self.django, self.ama, 'Again', 'Second topic')
+        self.reply(topic, self.john)
+
+        users, boards = self.rollups()
+        self.assertEqual(users, {
+            (self.ama.pk, self.django.pk, self.today, 2, 2),
+            (self.john.pk, self.django.pk, self.today, 1, 0),
+        })
+        self.assertEqual(boards, {(self.django.pk, self.today, 3, 2)})
+
+    def test_backfill_matches_incremental(self):
+        for i in range(3):
+            topic = create_topic(self.django, self.ama, f'Topic {i}', 'First post')
+            self.reply(topic, self.john)
+        create_topic(self.python, self.john, 'Python', 'First post')
+        incremental = self.rollups()
+
+        out = StringIO()
+        call_command('backfill_activity', chunk_size=2, stdout=out)
+        self.assertEqual(self.rollups(), incremental)
+        self.assertIn('from 7 posts', out.getvalue())
+
+    def test_backfill_counts_history(self):
+        topic = Topic.objects.create(subject='Old', board=self.django, starter=self.ama)
+        Post.objects.create(message='Old post', topic=topic, created_by=self.ama)
+        Post.objects.create(message='Old reply', topic=topic, created_by=self.ama)
+        self.assertEqual(backfill_activity(), 2)
+        self.assertEqual(self.rollups()[1], {(self.django.pk, self.today, 2, 1)})
+
+
+class ModerationRollupTests(StatsTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        topic = create_topic(cls.django, cls.ama, 'Hello', 'First post')
+        cls.reply(topic, cls.john)
+
+    def test_move_topics(self):
+        move_topics(Topic.objects.all(), self.python)
+        users, boards = self.rollups()
+        self.assertIn((self.python.pk, self.today, 2, 1), boards)
+        self.assertIn((self.django.pk, self.today, 0, 0), boards)
+        self.assertIn((self.john.pk, self.python.pk, self.today, 1, 0), users)
+
+    def test_delete_topics(self):
+        delete_topics(Topic.objects.all())
+        users, boards = self.rollups()
+        self.assertEqual(boards, {(self.django.pk, self.today, 0, 0)})
+        self.assertFalse(UserActivity.objects.filter(post_count__gt=0).exists())
+
+
+class StatsViewTests(StatsTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        topic = create_topic(cls.django, cls.ama, 'Hello', 'First post')
+        cls.reply(topic, cls.ama)
+        cls.reply(topic, cls.john)
+
+    def test_board_stats_reads_only_rollups(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('board_stats', kwargs={'pk': self.django.pk}), {'days': 7})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([query for query in queries if 'boards_post' in query['sql']])
+        self.assertEqual(len(response.context['activity']), 7)
+        self.assertEqual(response.context['activity'][-1]['active_users'], 2)
+        self.assertEqual(response.context['active_users'], 2)
+
+    def test_top_makers(self):
+        response = self.client.get(reverse('top_makers'))
+        self.assertEqual(
+            [(maker.user_display.username, maker.post_count) for maker in response.context['makers']],
+            [('ama', 2), ('john', 1)]
+        )
+        self.assertContains(response, 'john')
@@ -0,0 +1,120 @@
+import gzip
+import re
+import time
+import zlib
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.shortcuts import reverse
+from django.contrib.auth.models import AnonymousUser, User
+
+from maker_board.compression import compress_stream
+
+from ..middleware import AnonymousPageCacheMiddleware
+from ..models import Board, Topic
+from ..views import board_topics
+from .utils import FileDatabaseMixin, run_concurrently
+
+
+def normalize(html):
+    return re.sub(r'\s*([<>])\s*', r'\1', ' '.join(html.split()))
+
+
+# Without the page cache, which keeps pages it may store from being streamed
+@override_settings(STREAMING_LISTING_THRESHOLD=5, STREAMING_BATCH_SIZE=2, PAGE_CACHE_TIMEOUT=0)
+class StreamedListingTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        self.board = Board.objects.create(name='Django', description='Django Board.', topic_count=5)
+        Topic.objects.bulk_create(Topic(subject=f'Topic {i}', board=self.board, starter=user) for i in range(5))
+        self.url = reverse('board_topics', kwargs={'pk': self.board.pk})
+
+    def test_streams_same_page(self):
+        response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+        streamed = b''.join(response.streaming_content).decode()
+        with override_settings(STREAMING_LISTING_THRESHOLD=10):
+            rendered = self.client.get(self.url).content.decode()
+        self.assertEqual(normalize(streamed), normalize(rendered))
+
+    def test_head_sent_before_rows(self):
+        chunks = list(self.client.get(self.url).streaming_content)
+        self.assertIn(b'navbar', chunks[0])
+        self.assertNotIn(b'Topic 0', chunks[0])
+        # Two rows per batch, then the rest of the page
+        self.assertEqual(len(chunks), 1 + 3 + 1)
+
+    def test_small_board_not_streamed(self):
+        Board.objects.filter(pk=self.board.pk).update(topic_count=4)
+        self.assertFalse(self.client.get(self.url).streaming)
+
+    def test_gzip_flushes_each_chunk(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        chunks = list(response.streaming_content)
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self.assertIn(b'navbar', decompressor.decompress(b''.join(chunks[:2])))
+        self.assertIn(b'Topic 0', gzip.decompress(b''.join(chunks)))
+
+
+
+@override_settings(STREAMING_LISTING_THRESHOLD=5, PAGE_CACHE_TIMEOUT=60)
+class PageCacheListingTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        self.board = Board.objects.create(name='Django', description='Django Board.', topic_count=5)
+        Topic.objects.bulk_create(Topic(subject=f'Topic {i}', board=self.board, starter=user) for i in range(5))
+        self.url = reverse('board_topics', kwargs={'pk': self.board.pk})
+
+    def test_anonymous_page_rendered_whole_and_stored(self):
+        first = self.client.get(self.url)
+        self.assertFalse(first.streaming)
+        second = self.client.get(self.url)
+        self.assertEqual(second['X-Page-Cache'], 'hit')
+        self.assertEqual(second.content, first.content)
+
+    def test_logged_in_page_streamed(self):
+        self.client.login(username='john', password='123')
+        response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+        self.assertFalse(response.has_header('X-Page-Cache'))
+
+
+@override_settings(STREAMING_LISTING_THRESHOLD=5, PAGE_CACHE_TIMEOUT=60)
+class ConcurrentPageCacheMissTests(FileDatabaseMixin, TransactionTestCase):
+
+    def test_concurrent_misses_render_once(self):
+        cache.clear()
+        user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+        board = Board.objects.create(name='Django', description='Django Board.', topic_count=5)
+        Topic.objects.bulk_create(Topic(subject=f'Topic {i}', board=board, starter=user) for i in range(5))
+        url = reverse('board_topics', kwargs={'pk': board.pk})
+        renders = []
+
+        def view(request):
+            renders.append(request)
+            # Long enough for every reader to miss while the first renders
+            time.sleep(0.2)
+            return board_topics(request, pk=board.pk)
+
+        middleware = AnonymousPageCacheMiddleware(view)
+        responses = []
+
+        def reader():
+            request = RequestFactory().get(url)
+            request.user = AnonymousUser()
+            responses.append(middleware(request))
+
+        self.assertEqual(run_concurrently(reader, [()] * 5), [])
+        self.assertEqual(len(renders), 1)
+        self.assertEqual(len({response.content for response in responses}), 1)
+
+
+class CompressStreamTests(TestCase):
+
+    def test_round_trip(self):
+        self.assertEqual(gzip.decompress(b''.join(compress_stream([b'abc', b'', b'def']))), b'abcdef')
@@ -1,8 +1,14 @@
+import re
+
 from django.test import TestCase
 from django import forms
 from django.contrib.auth.models import User
+from django.template import engines
 
-from ..templatetags.form_tags import field_type, input_class
+from accounts.forms import SignUpForm
+from ..forms import NewTopicForm, PostForm
+from ..management.commands.bench_form_rendering import LEGACY_FORM_TEMPLATE, RENDER_FORM_TEMPLATE
+from ..templatetags.form_tags import field_type, form_layout, input_class
 
 class ExampleForm(forms.Form):
     username = forms.CharField(max_length=50, required=True)
@@ -32,3 +38,36 @@ class InuptClassTests(TestCase):
     def test_invalid_bound_field(self):
         form = ExampleForm({'username': '', 'password': '123456'})
         self.assertEqual('form-control invalid', input_class(form['username']))
+
+class RenderFormTests(TestCase):
+
+    def assertRendersLikeTemplateLoop(self, form):
+        engine = engines['django']
+        normalize = lambda html: re.sub(r'\s*([<>])\s*', r'\1', ' '.join(html.split()))
+        self.assertEqual(
+            normalize(engine.from_string(RENDER_FORM_TEMPLATE).render({'form': form})),
+            normalize(engine.from_string(LEGACY_FORM_TEMPLATE).render({'form': form}))
+        )
+
+    def test_unbound(self):
+        self.assertRendersLikeTemplateLoop(SignUpForm())
+        self.assertRendersLikeTemplateLoop(NewTopicForm())
+
+    def test_bound_with_errors(self):
+        form = SignUpForm({'username': 'ama', 'email': 'ama', 'password1': 'a', 'password2': 'b'})
+        self.assertRendersLikeTemplateLoop(form)
+        self.assertRendersLikeTemplateLoop(NewTopicForm({'subject': 'Hello'}))
+
+    def test_non_field_errors(self):
+        form = ExampleForm({'username': 'ama', 'password': '123456'})
+        form.is_valid()
+        form.add_error(None, 'First')
+        form.add_error(None, 'Second')
+        self.assertRendersLikeTemplateLoop(form)
+
+    def test_hidden_fields(self):
+        self.assertRendersLikeTemplateLoop(PostForm(initial={'version': 3}))
+
+    def test_layout_memoized_per_prefix(self):
+        self.assertIs(form_layout(NewTopicForm()), form_layout(NewTopicForm({'subject': 'Hello'})))
+        self.assertIsNot(form_layout(NewTopicForm()), form_layout(NewTopicForm(prefix='other')))
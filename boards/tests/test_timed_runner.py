@@ -0,0 +1,46 @@
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+
+from django.test import SimpleTestCase
+
+from maker_board.test_runner import TimedRemoteTestResult, TimedTestRunner, TimedTextTestResult
+
+
+class TimedTestRunnerTests(SimpleTestCase):
+
+    # Nested so that discovery does not pick it up as tests of its own
+    class Example(unittest.TestCase):
+
+        def test_one(self):
+            pass
+
+        def test_two(self):
+            pass
+
+    def run_suite(self, **kwargs):
+        runner = TimedTestRunner(verbosity=0, **kwargs)
+        out = StringIO()
+        with redirect_stdout(out), redirect_stderr(StringIO()):
+            result = runner.run_suite(unittest.defaultTestLoader.loadTestsFromTestCase(self.Example))
+        return result, out.getvalue()
+
+    def test_reports_slowest(self):
+        result, out = self.run_suite(slowest=1)
+        self.assertEqual(set(result.durations), {self.Example('test_one').id(), self.Example('test_two').id()})
+        self.assertIn('Slowest 1 of 2 tests', out)
+
+    def test_report_turned_off(self):
+        self.assertEqual(self.run_suite(slowest=0)[1], '')
+
+    def test_worker_durations_replayed(self):
+        test = self.Example('test_one')
+        remote = TimedRemoteTestResult()
+        remote.startTest(test)
+        remote.addSuccess(test)
+        remote.stopTest(test)
+
+        result = TimedTextTestResult(StringIO(), False, 0)
+        for event in remote.events:
+            getattr(result, event[0])(test, *event[2:])
+        self.assertEqual(result.durations[test.id()], remote.events[-2][2])
@@ -0,0 +1,116 @@
+from unittest import mock
+
+from django.test import TestCase, TransactionTestCase
+from django.shortcuts import reverse
+from django.urls import resolve
+from django.contrib.auth.models import User
+
+from ..forms import PostForm
+from ..views import edit_post
+from ..models import Board, Topic, Post
+from .utils import FileDatabaseMixin, run_concurrently
+
+
+def create_post(username='john'):
+    board = Board.objects.create(name='Django', description='Django Board.')
+    user = User.objects.create_user(username=username, email='john@doe.com', password='123')
+    topic = Topic.objects.create(subject='Hello', board=board, starter=user, post_count=1)
+    post = Post.objects.create(message='First line', topic=topic, created_by=user)
+    url = reverse('edit_post', kwargs={'pk': board.pk, 'topic_pk': topic.pk, 'post_pk': post.pk})
+    return post, url
+
+
+class EditPostTests(TestCase):
+
+    def setUp(self):
+        self.post, self.url = create_post()
+        self.client.login(username='john', password='123')
+
+    def test_edit_post_url_resolves_to_edit_post_view(self):
+        view = resolve(self.url)
+        self.assertEqual(view.func, edit_post)
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(self.url)
+        self.assertRedirects(response, f'{reverse("login")}?next={self.url}')
+
+    def test_only_author_can_edit(self):
+        User.objects.create_user(username='ama', password='123')
+        self.client.login(username='ama', password='123')
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_form_carries_version(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, 'type="hidden" name="version" value="1"')
+
+    def test_successful_edit(self):
+        response = self.client.post(self.url, {'message': 'Edited', 'version': 1})
+        self.assertRedirects(response, reverse('board_topics', kwargs={'pk': self.post.topic.board.pk}))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.message, 'Edited')
+        self.assertEqual(self.post.version, 2)
+        self.assertIsNotNone(self.post.updated_at)
+        self.assertEqual(self.post.updated_by.username, 'john')
+
+    def test_deleted_post(self):
+        Post.objects.filter(pk=self.post.pk).delete()
+        response = self.client.post(self.url, {'message': 'Edited', 'version': 1})
+        self.assertEqual(response.status_code, 404)
+
+    def test_post_deleted_while_saving(self):
+        clean = PostForm.clean
+
+        def clean_then_delete(form):
+            # The moderator's delete lands between the lookup and the UPDATE
+            Post.objects.filter(pk=self.post.pk).delete()
+            return clean(form)
+
+        with mock.patch.object(PostForm, 'clean', clean_then_delete):
+            response = self.client.post(self.url, {'message': 'Edited', 'version': 1})
+        self.assertEqual(response.status_code, 404)
+
+    def test_stale_version_conflicts(self):
+        self.client.post(self.url, {'message': 'From the first tab', 'version': 1})
+        response = self.client.post(self.url, {'message': 'From the second tab', 'version': 1})
+
+        self.assertEqual(response.status_code, 409)
+        self.assertContains(response, '-From the first tab', status_code=409)
+        self.assertContains(response, '+From the second tab', status_code=409)
+        self.assertEqual(response.context['form'].initial['version'], 2)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.message, 'From the first tab')
+
+
+class ConcurrentEditPostTests(FileDatabaseMixin, TransactionTestCase):
+
+    def test_concurrent_editors_lose_no_updates(self):
+        '''
+        Every editor appends a line and retries on conflict, like a user
+        resubmitting after reviewing the diff. Each successful save must be
+        built on the previous one, so all lines survive.
+        '''
+        post, url = create_post()
+        editors = 8
+
+        clients = []
+        for _ in range(editors):
+            client = self.client_class()
+            client.login(username='john', password='123')
+            clients.append(client)
+
+        def editor(number):
+            client = clients[number]
+            while True:
+                current = Post.objects.get(pk=post.pk)
+                message = f'{current.message}\nEditor {number}'
+                response = client.post(url, {'message': message, 'version': current.version})
+                if response.status_code == 302:
+                    return
+                self.assertEqual(response.status_code, 409)
+
+        self.assertEqual(run_concurrently(editor, [(i,) for i in range(editors)]), [])
+        post.refresh_from_db()
+        self.assertEqual(post.version, editors + 1)
+        for i in range(editors):
+            self.assertIn(f'Editor {i}', post.message)
@@ -1,11 +1,13 @@
 from django.test import TestCase
 from django.shortcuts import reverse
 from django.urls import resolve
-from django.contrib.auth.models import User
+
+from accounts.tests.factories import make_users
 
 from ..views import board_topics, home, new_topic
 from ..models import Board, Topic, Post
 from ..forms import NewTopicForm
+from .factories import make_boards
 
 class HomeTests(TestCase):
 
@@ -30,11 +32,12 @@ class HomeTests(TestCase):
 
 class BoardTopicsTests(TestCase):
 
-    def setUp(self):
-        Board.objects.create(name='Django', description='Django Board')
+    @classmethod
+    def setUpTestData(cls):
+        cls.board, = make_boards('Django')
 
     def test_board_topics_success_status_code(self):
-        url = reverse('board_topics', kwargs={'pk': 1})
+        url = reverse('board_topics', kwargs={'pk': self.board.pk})
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
 
@@ -48,28 +51,44 @@ class BoardTopicsTests(TestCase):
         self.assertEqual(view.func, board_topics)
 
     def test_board_topics_view_contains_link_back_to_home_page(self):
-        board_topics_url = reverse('board_topics', kwargs={'pk': 1})
+        board_topics_url = reverse('board_topics', kwargs={'pk': self.board.pk})
         response = self.client.get(board_topics_url)
         home_url = reverse('home')
         self.assertContains(response, f'href="{home_url}"')
 
     def test_board_topics_contains_new_topic_link(self):
-        board_topics_url = reverse('board_topics', kwargs={'pk': 1})
+        board_topics_url = reverse('board_topics', kwargs={'pk': self.board.pk})
         response = self.client.get(board_topics_url)
-        new_topic_url = reverse('new_topic', kwargs={'pk': 1})
+        new_topic_url = reverse('new_topic', kwargs={'pk': self.board.pk})
 
         self.assertContains(response, f'href="{new_topic_url}"')
 
 
 
+class LoginRequiredNewTopicTests(TestCase):
+
+    def setUp(self):
+        board = Board.objects.create(name='Django', description='Django Board.')
+        self.url = reverse('new_topic', kwargs={'pk': board.pk})
+        self.response = self.client.get(self.url)
+
+    def test_redirection(self):
+        login_url = reverse('login')
+        self.assertRedirects(self.response, f'{login_url}?next={self.url}')
+
+
 class NewTopicTests(TestCase):
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.board, = make_boards('Django')
+        make_users('john', password='123')
+
     def setUp(self):
-        Board.objects.create(name='Django', description='Django Board.')
-        User.objects.create_user(username='john', email='john@doe.com', password='123') 
+        self.client.login(username='john', password='123')
 
     def test_new_topic_view_success_status_code(self):
-        url = reverse('new_topic', kwargs={'pk': 1 })
+        url = reverse('new_topic', kwargs={'pk': self.board.pk})
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, 200)
@@ -85,26 +104,26 @@ class NewTopicTests(TestCase):
         self.assertEqual(view.func, new_topic)
 
     def test_new_topic_view_points_to_topic_template(self):
-        url = reverse('new_topic', kwargs={'pk': 1})
+        url = reverse('new_topic', kwargs={'pk': self.board.pk})
         response = self.client.get(url)
         
         self.assertTemplateUsed(response, 'boards/new_topic.html')
 
     def test_new_topic_view_contains_link_back_to_board_topics(self):
-        new_topic_url = reverse('new_topic', kwargs={'pk': 1})
+        new_topic_url = reverse('new_topic', kwargs={'pk': self.board.pk})
         response = self.client.get(new_topic_url)
-        board_topics_url = reverse('board_topics', kwargs={'pk': 1})
+        board_topics_url = reverse('board_topics', kwargs={'pk': self.board.pk})
 
         self.assertContains(response, f'href="{board_topics_url}"')
 
 
     def test_form_csrf(self):
-        url = reverse('new_topic', kwargs={'pk': 1})
+        url = reverse('new_topic', kwargs={'pk': self.board.pk})
         response = self.client.get(url)
         self.assertContains(response, 'csrfmiddlewaretoken')
 
     def test_new_topic_valid_form_data(self):
-        url = reverse('new_topic', kwargs={'pk': 1})
+        url = reverse('new_topic', kwargs={'pk': self.board.pk})
         data = {
             'subject': 'Test Title',
             'message': 'Test Message'
@@ -114,8 +133,21 @@ class NewTopicTests(TestCase):
         self.assertTrue(Topic.objects.exists())
         self.assertTrue(Post.objects.exists())
 
+    def test_new_topic_started_by_logged_in_user(self):
+        url = reverse('new_topic', kwargs={'pk': self.board.pk})
+        data = {
+            'subject': 'Test Title',
+            'message': 'Test Message'
+        }
+
+        self.client.post(url, data)
+        topic = Topic.objects.get()
+        self.assertEqual(topic.starter.username, 'john')
+        self.assertEqual(topic.posts.get().created_by.username, 'john')
+        self.assertEqual(topic.board.topic_count, 1)
+
     def test_new_topic_invalid_form_data(self):
-        url = reverse('new_topic', kwargs={'pk': 1})
+        url = reverse('new_topic', kwargs={'pk': self.board.pk})
         data = {}
         response = self.client.post(url, data)
         self.assertEqual(response.status_code, 200)
@@ -123,7 +155,7 @@ class NewTopicTests(TestCase):
         self.assertFalse(Post.objects.exists())
 
     def test_new_topic_empty_form_data(self):
-        url = reverse('new_topic', kwargs={'pk': 1})
+        url = reverse('new_topic', kwargs={'pk': self.board.pk})
         data = {
             'subject': '',
             'message': ''
@@ -135,7 +167,7 @@ class NewTopicTests(TestCase):
         self.assertFalse(Post.objects.exists())
 
     def test_new_topic_invalid_data_should_contain_errors(self):
-        url = reverse('new_topic', kwargs={'pk': 1})
+        url = reverse('new_topic', kwargs={'pk': self.board.pk})
         data = {}
         response = self.client.post(url, data)
         form = response.context.get('form')
@@ -143,7 +175,7 @@ class NewTopicTests(TestCase):
         self.assertTrue(form.errors)
 
     def test_new_topic_contains_form(self):
-        url = reverse('new_topic', kwargs={'pk': 1})
+        url = reverse('new_topic', kwargs={'pk': self.board.pk})
         response = self.client.get(url)
         form = response.context.get('form')
         self.assertEqual(response.status_code, 200)
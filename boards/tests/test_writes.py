@@ -0,0 +1,75 @@
+from unittest import mock
+
+from django.test import TestCase, TransactionTestCase
+from django.shortcuts import reverse
+from django.db import IntegrityError
+from django.contrib.auth.models import User
+
+from .. import writes
+from ..models import Board, Topic, Post
+from ..writes import GroupCommitter, NewTopic, create_topic
+from .utils import FileDatabaseMixin, run_concurrently
+
+
+class CreateTopicTests(TestCase):
+
+    def setUp(self):
+        self.board = Board.objects.create(name='Django', description='Django Board.')
+        self.user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+
+    def test_create_topic(self):
+        topic = create_topic(self.board, self.user, 'Hello', 'First post')
+        self.assertEqual(topic.posts.get().message, 'First post')
+        self.board.refresh_from_db()
+        self.assertEqual((self.board.topic_count, self.board.post_count), (1, 1))
+
+    def test_create_topic_is_atomic(self):
+        with mock.patch.object(Post.objects, 'create', side_effect=IntegrityError):
+            with self.assertRaises(IntegrityError):
+                create_topic(self.board, self.user, 'Hello', 'First post')
+        self.assertFalse(Topic.objects.exists())
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.topic_count, 0)
+
+
+class GroupCommitTests(FileDatabaseMixin, TransactionTestCase):
+
+    def setUp(self):
+        self.board = Board.objects.create(name='Django', description='Django Board.')
+        self.user = User.objects.create_user(username='john', email='john@doe.com', password='123')
+
+    def submit_concurrently(self, committer, submissions):
+        return run_concurrently(committer.submit, [(submission,) for submission in submissions])
+
+    def test_concurrent_submissions_share_commits(self):
+        committer = GroupCommitter(window=0.05, max_batch=100)
+        submissions = [NewTopic(self.board, self.user, f'Topic {i}', 'Message') for i in range(20)]
+
+        with mock.patch.object(writes, 'create_topics', wraps=writes.create_topics) as create_topics:
+            errors = self.submit_concurrently(committer, submissions)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(Topic.objects.count(), 20)
+        self.assertEqual(Post.objects.count(), 20)
+        self.assertLess(create_topics.call_count, 20)
+        self.board.refresh_from_db()
+        self.assertEqual((self.board.topic_count, self.board.post_count), (20, 20))
+
+    def test_failed_submission_does_not_fail_batch(self):
+        committer = GroupCommitter(window=0.05, max_batch=100)
+        missing_board = Board(pk=999, name='Gone')
+        submissions = [NewTopic(self.board, self.user, f'Topic {i}', 'Message') for i in range(5)]
+        submissions.append(NewTopic(missing_board, self.user, 'Orphan', 'Message'))
+
+        errors = self.submit_concurrently(committer, submissions)
+
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(Topic.objects.count(), 5)
+
+    def test_new_topic_view_with_group_commit(self):
+        self.client.login(username='john', password='123')
+        url = reverse('new_topic', kwargs={'pk': self.board.pk})
+        with self.settings(BOARDS_GROUP_COMMIT=True):
+            response = self.client.post(url, {'subject': 'Test Title', 'message': 'Test Message'})
+        self.assertRedirects(response, reverse('board_topics', kwargs={'pk': self.board.pk}))
+        self.assertTrue(Topic.objects.filter(subject='Test Title', starter=self.user).exists())
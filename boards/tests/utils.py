@@ -0,0 +1,65 @@
+import os
+import tempfile
+import threading
+
+from django.core.management import call_command
+from django.db import connection
+
+
+class FileDatabaseMixin:
+    '''
+    Runs a TransactionTestCase against a temporary file-backed SQLite database.
+
+    The in-memory test database is shared between threads through SQLite's
+    shared cache, whose table locks fail immediately with "database table is
+    locked" instead of waiting like a real database does. Tests that hit the
+    database from several threads at once need a file to behave like
+    production.
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        fd, cls.database_path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(fd)
+        cls.original_database_name = connection.settings_dict['NAME']
+        # Closing the last connection to an in-memory database destroys it, so
+        # keep it aside rather than closing it. Connections opened by other
+        # threads share this settings dict and pick up the new name too.
+        connection.ensure_connection()
+        cls.original_connection = connection.connection
+        connection.connection = None
+        connection.settings_dict['NAME'] = cls.database_path
+        call_command('migrate', verbosity=0, interactive=False)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connection.close()
+        connection.settings_dict['NAME'] = cls.original_database_name
+        connection.connection = cls.original_connection
+        os.remove(cls.database_path)
+
+
+def run_concurrently(func, calls):
+    '''
+    Calls `func` with each tuple of arguments in `calls`, all at once on
+    threads of their own, and waits for them. Returns the exceptions raised.
+    Each thread closes its database connection when done.
+    '''
+    errors = []
+
+    def run(*args):
+        try:
+            func(*args)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=run, args=args) for args in calls]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
@@ -1,8 +1,11 @@
 from django.urls import path
 
-from .views import board_topics, new_topic
+from .views import board_topics, board_stats, new_topic, edit_post, top_makers
 
 urlpatterns = [
     path('<int:pk>/', board_topics, name='board_topics'),
-    path('<int:pk>/new/', new_topic, name='new_topic')
+    path('<int:pk>/stats/', board_stats, name='board_stats'),
+    path('makers/', top_makers, name='top_makers'),
+    path('<int:pk>/new/', new_topic, name='new_topic'),
+    path('<int:pk>/topics/<int:topic_pk>/posts/<int:post_pk>/edit/', edit_post, name='edit_post')
 ]
\ No newline at end of file
@@ -1,14 +1,28 @@
+import difflib
+
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import HttpResponse
-from django.contrib.auth.models import User
+from django.http import Http404, HttpResponse
+from django.db.models import F
+from django.conf import settings
+from django.utils import timezone
+from django.contrib.auth.decorators import login_required
+
+from accounts.display import attach_users
 
 from .models import Board, Topic, Post
-from .forms import NewTopicForm
+from .forms import NewTopicForm, PostForm
+from .streaming import stream_listing
+from .writes import submit_topic
+from . import stats
+
+STATS_DAYS = [7, 30, 90]
 
 def home(request):
     boards = Board.objects.all()
+    hot_topics = Topic.objects.select_related('board').order_by('-hot_score')[:settings.HOT_TOPICS_LIMIT]
     context = {
-        'boards': boards
+        'boards': boards,
+        'hot_topics': hot_topics
     }
     return render(request, 'home.html', context)
 
@@ -16,29 +30,77 @@ def home(request):
 def board_topics(request, pk):
 
     board = get_object_or_404(Board, pk=pk)
+    sort = request.GET.get('sort')
+    ordering = '-hot_score' if sort == 'hot' else '-last_updated'
+    topics = board.topics.order_by(ordering)
     context = {
-        'board': board
+        'board': board,
+        'sort': sort
     }
 
+    # Long boards are sent as they render instead of being built in memory
+    # first, unless the page cache is going to keep the whole page anyway
+    streamed = board.topic_count >= settings.STREAMING_LISTING_THRESHOLD
+    if streamed and not getattr(request, 'page_cacheable', False):
+        return stream_listing(
+            request, 'boards/topics.html', context, 'boards/includes/topic_rows.html', 'topics', topics,
+            prepare=lambda batch: attach_users(batch, 'starter_id', 'starter_display')
+        )
+
+    context['topics'] = attach_users(topics, 'starter_id', 'starter_display')
     return render(request, 'boards/topics.html', context)
 
+def stats_days(request):
+    try:
+        days = int(request.GET.get('days', 30))
+    except ValueError:
+        days = 30
+    return days if days in STATS_DAYS else 30
+
+
+def board_stats(request, pk):
+    '''
+    Reads only the activity rollups, see boards/stats.py
+    '''
+    board = get_object_or_404(Board, pk=pk)
+    days = stats_days(request)
+    start, end = stats.day_range(days)
+    makers = attach_users(stats.top_makers(start, end, board=board), 'user_id', 'user_display')
+    context = {
+        'board': board,
+        'days': days,
+        'day_choices': STATS_DAYS,
+        'activity': stats.board_activity(board, start, end),
+        'active_users': stats.active_user_count(board, start, end),
+        'makers': makers
+    }
+    return render(request, 'boards/board_stats.html', context)
+
+
+def top_makers(request):
+    days = stats_days(request)
+    start, end = stats.day_range(days)
+    context = {
+        'days': days,
+        'day_choices': STATS_DAYS,
+        'makers': attach_users(stats.top_makers(start, end, limit=50), 'user_id', 'user_display')
+    }
+    return render(request, 'boards/top_makers.html', context)
+
+
+@login_required
 def new_topic(request, pk):
     board = get_object_or_404(Board, pk=pk)
-    user = User.objects.first()
 
     if request.method == 'POST':
         form = NewTopicForm(request.POST)
 
         if form.is_valid():
-            topic = form.save(commit=False)
-            topic.board = board
-            topic.starter = user
-            topic.save()
-            
-            post = Post.objects.create(
-                message = form.cleaned_data.get('message'),
-                topic = topic,
-                created_by = user
+            submit_topic(
+                board=board,
+                starter=request.user,
+                subject=form.cleaned_data.get('subject'),
+                message=form.cleaned_data.get('message')
             )
 
             return redirect('board_topics', pk=board.pk)
@@ -51,4 +113,56 @@ def new_topic(request, pk):
         'form': form
     }
 
-    return render(request, 'boards/new_topic.html', context)
\ No newline at end of file
+    return render(request, 'boards/new_topic.html', context)
+
+@login_required
+def edit_post(request, pk, topic_pk, post_pk):
+    '''
+    Optimistic concurrency: nothing is locked while the user edits. The save is
+    a single conditional UPDATE that only matches the version the user started
+    from, so a concurrent edit turns into a conflict instead of a lost update.
+    '''
+    post = get_object_or_404(
+        Post.objects.select_related('topic__board'),
+        pk=post_pk, topic__pk=topic_pk, topic__board__pk=pk, created_by=request.user
+    )
+
+    if request.method == 'POST':
+        form = PostForm(request.POST, instance=post)
+
+        if form.is_valid():
+            message = form.cleaned_data.get('message')
+            updated = Post.objects.filter(pk=post.pk, version=form.cleaned_data.get('version')).update(
+                message=message,
+                updated_at=timezone.now(),
+                updated_by=request.user,
+                version=F('version') + 1
+            )
+            if updated:
+                return redirect('board_topics', pk=pk)
+
+            current = Post.objects.filter(pk=post.pk).first()
+            if current is None:
+                # Deleted by a moderator while it was being edited
+                raise Http404('No Post matches the given query.')
+            diff = difflib.unified_diff(
+                current.message.splitlines(), message.splitlines(),
+                fromfile='current', tofile='yours', lineterm=''
+            )
+            form = PostForm(initial={'message': message, 'version': current.version})
+            context = {
+                'post': current,
+                'form': form,
+                'conflict': '\n'.join(diff)
+            }
+            return render(request, 'boards/edit_post.html', context, status=409)
+
+    else:
+        form = PostForm(instance=post)
+
+    context = {
+        'post': post,
+        'form': form
+    }
+
+    return render(request, 'boards/edit_post.html', context)
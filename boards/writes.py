@@ -0,0 +1,177 @@
+"""
+Write paths for new topics and replies.
+
+`create_topics` writes any number of topics, their opening posts, the
+board counters and the activity rollups in a single transaction: one commit, hence one fsync, however
+many topics there are. `create_reply` does the same for a reply to an
+existing topic and also moves the topic up the hot list.
+
+With `BOARDS_GROUP_COMMIT` on, `submit_topic` hands the submission to a
+background writer instead. The writer collects everything submitted within
+`BOARDS_GROUP_COMMIT_WINDOW` seconds (up to `BOARDS_GROUP_COMMIT_MAX_BATCH`)
+and commits it together, so under a high post rate many requests share one
+commit. Each request still waits for its own commit before it returns.
+"""
+import queue
+import threading
+import time
+from collections import Counter, namedtuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.shortcuts import reverse
+from django.utils import timezone
+
+from .cache import purge_pages
+from .models import Board, Topic, Post
+from .ranking import hot_score, record_post
+from .stats import record_activity
+
+NewTopic = namedtuple('NewTopic', ['board', 'starter', 'subject', 'message'])
+
+
+def create_topics(submissions):
+    now = timezone.now()
+    topics = []
+    activity = []
+    with transaction.atomic():
+        for submission in submissions:
+            topic = Topic.objects.create(
+                subject=submission.subject,
+                board=submission.board,
+                starter=submission.starter,
+                post_count=1,
+                hot_score=hot_score(1, now)
+            )
+            post = Post.objects.create(message=submission.message, topic=topic, created_by=submission.starter)
+            topics.append(topic)
+            activity.append((submission.starter.pk, submission.board.pk, post.created_at, True))
+
+        per_board = Counter(submission.board.pk for submission in submissions)
+        for board_pk, count in per_board.items():
+            Board.objects.filter(pk=board_pk).update(
+                topic_count=F('topic_count') + count, post_count=F('post_count') + count
+            )
+        record_activity(activity)
+        transaction.on_commit(lambda: purge_pages(
+            reverse('home'), *(reverse('board_topics', kwargs={'pk': pk}) for pk in per_board)
+        ))
+    return topics
+
+
+def create_topic(board, starter, subject, message):
+    return create_topics([NewTopic(board, starter, subject, message)])[0]
+
+
+def create_reply(topic, user, message):
+    '''
+    Writes a reply to `topic` together with the topic's count and hot score,
+    the board counter and the activity rollups
+    '''
+    with transaction.atomic():
+        post = Post.objects.create(message=message, topic=topic, created_by=user)
+        record_post(topic, post.created_at)
+        Board.objects.filter(pk=topic.board_id).update(post_count=F('post_count') + 1)
+        record_activity([(user.pk, topic.board_id, post.created_at, False)])
+        transaction.on_commit(lambda: purge_pages(
+            reverse('home'), reverse('board_topics', kwargs={'pk': topic.board_id})
+        ))
+    return post
+
+
+class PendingTopic:
+
+    def __init__(self, submission):
+        self.submission = submission
+        self.topic = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class GroupCommitter:
+    '''
+    Background writer that coalesces concurrent submissions into shared transactions
+    '''
+
+    def __init__(self, window, max_batch, timeout=30):
+        self.window = window
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self.queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, submission):
+        self.start()
+        pending = PendingTopic(submission)
+        self.queue.put(pending)
+        if not pending.done.wait(self.timeout):
+            raise TimeoutError('Group commit did not complete in time')
+        if pending.error is not None:
+            raise pending.error
+        return pending.topic
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='group-commit', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._commit(batch)
+
+    def _commit(self, batch):
+        try:
+            self._write(batch)
+        except Exception:
+            # One bad submission must not fail the others: retry them one at a time
+            for pending in batch:
+                try:
+                    self._write([pending])
+                except Exception as e:
+                    pending.error = e
+        finally:
+            for pending in batch:
+                pending.done.set()
+
+    def _write(self, batch):
+        try:
+            topics = create_topics([pending.submission for pending in batch])
+        finally:
+            connection.close_if_unusable_or_obsolete()
+        for pending, topic in zip(batch, topics):
+            pending.topic = topic
+
+
+_group_committer = None
+_group_committer_lock = threading.Lock()
+
+
+def get_group_committer():
+    global _group_committer
+    with _group_committer_lock:
+        if _group_committer is None:
+            _group_committer = GroupCommitter(
+                window=getattr(settings, 'BOARDS_GROUP_COMMIT_WINDOW', 0.005),
+                max_batch=getattr(settings, 'BOARDS_GROUP_COMMIT_MAX_BATCH', 100)
+            )
+        return _group_committer
+
+
+def submit_topic(board, starter, subject, message):
+    submission = NewTopic(board, starter, subject, message)
+    if getattr(settings, 'BOARDS_GROUP_COMMIT', False):
+        return get_group_committer().submit(submission)
+    return create_topic(*submission)
@@ -0,0 +1,25 @@
+from django.contrib.admin.apps import SimpleAdminConfig
+from django.contrib.admin.checks import check_admin_app, check_dependencies
+from django.core import checks
+
+
+def check_discovered_admin(app_configs, **kwargs):
+    '''
+    Django's admin checks, run after the admin modules are imported. They
+    would otherwise see an empty registry, since the admin is only
+    autodiscovered on its first request.
+    '''
+    from .lazy_urls import discover_admin
+
+    discover_admin()
+    return check_admin_app(app_configs, **kwargs)
+
+
+class LazyAdminConfig(SimpleAdminConfig):
+    '''
+    The admin without autodiscovery at startup, see maker_board.lazy_urls
+    '''
+
+    def ready(self):
+        checks.register(check_dependencies, checks.Tags.admin)
+        checks.register(check_discovered_admin, checks.Tags.admin)
@@ -0,0 +1,42 @@
+"""
+Helpers shared by the `bench_*` management commands.
+
+Benchmarks run against a throwaway copy of the database created the same way
+the test runner creates one, so they never touch real data.
+"""
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+
+
+@contextmanager
+def benchmark_database(on_disk=False):
+    '''
+    SQLite test databases live in memory unless `on_disk` is set, which write
+    benchmarks need so that commits pay for real fsyncs
+    '''
+    old_name = connection.settings_dict['NAME']
+    old_test_name = connection.settings_dict['TEST']['NAME']
+    if on_disk and connection.vendor == 'sqlite':
+        connection.settings_dict['TEST']['NAME'] = os.path.join(tempfile.gettempdir(), 'maker_board_benchmark.sqlite3')
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        connection.settings_dict['TEST']['NAME'] = old_test_name
+
+
+def best_of(func, repeat=5):
+    '''
+    Fastest of `repeat` calls to `func`, in milliseconds
+    '''
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
@@ -0,0 +1,36 @@
+"""
+Gzip for whole and streamed responses.
+
+Django's GZipMiddleware compresses a streamed response as one deflate stream
+and only hands bytes on once zlib decides to emit them, which holds back the
+page head a streaming view sends early. Here every chunk of a streamed
+response is followed by a sync flush, so each one reaches the client as soon
+as it is produced, at a small cost in compression ratio.
+"""
+import zlib
+
+from django.middleware.gzip import GZipMiddleware
+
+
+def compress_stream(chunks, level=6):
+    # wbits 16 + MAX_WBITS writes a gzip header and trailer around the deflate stream
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class StreamingGZipMiddleware(GZipMiddleware):
+
+    def process_response(self, request, response):
+        if not response.streaming:
+            return super().process_response(request, response)
+
+        chunks = response.streaming_content
+        response = super().process_response(request, response)
+        if response.get('Content-Encoding') == 'gzip':
+            # Replaces GZipMiddleware's compressor, which has not started reading the chunks yet
+            response.streaming_content = compress_stream(chunks)
+        return response
@@ -0,0 +1,100 @@
+"""
+URL trees and views that are only imported when a request needs them.
+
+A worker should be able to serve `home` and `board_topics` as soon as it
+starts, so the admin (whose autodiscovery imports every `admin.py`) and the
+auth views behind the login and password flows wait for their first hit.
+"""
+from django.urls import URLResolver
+from django.urls.resolvers import RoutePattern
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+
+
+class LazyURLResolver(URLResolver):
+    '''
+    Resolver for a namespaced URL tree built by calling `loader`. The tree is
+    loaded the first time a URL under it is resolved or reversed.
+    '''
+
+    def __init__(self, pattern, loader, app_name, namespace):
+        super().__init__(pattern, None, app_name=app_name, namespace=namespace)
+        self.loader = loader
+
+    @cached_property
+    def urlconf_module(self):
+        return self.loader()
+
+    @property
+    def loaded(self):
+        return 'url_patterns' in self.__dict__
+
+    def _populate(self):
+        # The parent resolver populates its children along with itself; only
+        # namespaced trees can wait, since their names are looked up through
+        # the namespace rather than merged into the parent.
+        if self.loaded:
+            super()._populate()
+
+    @property
+    def reverse_dict(self):
+        self.url_patterns
+        return URLResolver.reverse_dict.fget(self)
+
+    @property
+    def namespace_dict(self):
+        self.url_patterns
+        return URLResolver.namespace_dict.fget(self)
+
+    @property
+    def app_dict(self):
+        self.url_patterns
+        return URLResolver.app_dict.fget(self)
+
+
+def lazy_include(route, loader, namespace):
+    '''
+    `path(route, include(...))` for a URL tree returned by `loader`
+    '''
+    return LazyURLResolver(RoutePattern(route, is_endpoint=False), loader, app_name=namespace, namespace=namespace)
+
+
+def discover_admin():
+    from django.contrib import admin
+
+    # INSTALLED_APPS uses LazyAdminConfig, so nothing is registered at startup
+    admin.autodiscover()
+    return admin.site
+
+
+def admin_urls():
+    return discover_admin().urls[0]
+
+
+class LazyView:
+    '''
+    Class-based view imported from `import_path` on its first request.
+    Reversing a URL does not touch the view, so pages linking to it don't
+    pay for the import either.
+    '''
+
+    def __init__(self, import_path, **initkwargs):
+        self.import_path = import_path
+        self.initkwargs = initkwargs
+
+    @cached_property
+    def view_class(self):
+        return import_string(self.import_path)
+
+    @cached_property
+    def view(self):
+        return self.view_class.as_view(**self.initkwargs)
+
+    def __call__(self, request, *args, **kwargs):
+        return self.view(request, *args, **kwargs)
+
+    def __getattr__(self, name):
+        # Attributes middleware reads off the view function, like csrf_exempt
+        if name.startswith('__') or name in ('view', 'view_class', 'import_path', 'initkwargs'):
+            raise AttributeError(name)
+        return getattr(self.view, name)
@@ -0,0 +1,143 @@
+"""
+Request profiling for production-like traffic.
+
+`SamplingProfilerMiddleware` profiles one request in every
+`PROFILER_SAMPLE_RATE`, plus any request made by a staff user with the
+`_profile` query parameter. By default a background thread samples the
+request thread's stack every `PROFILER_INTERVAL` seconds and the result is
+written in collapsed-stack format (one `frame;frame;frame count` line per
+unique stack), which `flamegraph.pl` and speedscope read directly. Staff can
+ask for a deterministic cProfile run instead with `?_profile=pstats`.
+
+Files are written to `PROFILER_DIR/<url name>/` and merged with
+`python manage.py merge_profiles`.
+"""
+import cProfile
+import itertools
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+
+PROFILE_PARAM = '_profile'
+
+# Numbers the profiles a process writes, so requests finishing within the
+# same second on the same thread don't overwrite each other's files
+_profile_numbers = itertools.count(1)
+
+
+def frame_label(frame):
+    code = frame.f_code
+    module = frame.f_globals.get('__name__', '?')
+    return f'{module}:{code.co_name}'
+
+
+def collapse_stack(frame):
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+class StackSampler:
+    '''
+    Samples the stack of one thread from a background thread.
+    Only the sampled thread's frames are walked, so the cost to the request
+    is the GIL hand-off every `interval` seconds.
+    '''
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[collapse_stack(frame)] += 1
+
+
+def profile_path(url_name, extension):
+    directory = os.path.join(settings.PROFILER_DIR, re.sub(r'[^\w.-]', '_', url_name))
+    os.makedirs(directory, exist_ok=True)
+    filename = f'{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}-{next(_profile_numbers)}.{extension}'
+    return os.path.join(directory, filename)
+
+
+def write_collapsed(path, stacks):
+    with open(path, 'w') as f:
+        for stack, count in stacks.most_common():
+            f.write(f'{stack} {count}\n')
+
+
+class SamplingProfilerMiddleware:
+    '''
+    Must come after `AuthenticationMiddleware` so the staff flag can be checked.
+    '''
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PROFILER_SAMPLE_RATE', 0)
+        self.interval = getattr(settings, 'PROFILER_INTERVAL', 0.005)
+        self.counter = itertools.count(1)
+
+    def __call__(self, request):
+        mode = self.profile_mode(request)
+        if mode is None:
+            return self.get_response(request)
+        if mode == 'pstats':
+            return self.profile_deterministic(request)
+        return self.profile_sampled(request)
+
+    def profile_mode(self, request):
+        flag = request.GET.get(PROFILE_PARAM)
+        if flag is not None:
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_staff:
+                return 'pstats' if flag == 'pstats' else 'sampled'
+        if self.sample_rate and next(self.counter) % self.sample_rate == 0:
+            return 'sampled'
+        return None
+
+    def profile_sampled(self, request):
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        sampler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            stacks = sampler.stop()
+        if stacks:
+            write_collapsed(profile_path(self.url_name(request), 'collapsed'), stacks)
+        return response
+
+    def profile_deterministic(self, request):
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        profiler.dump_stats(profile_path(self.url_name(request), 'pstats'))
+        return response
+
+    def url_name(self, request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None or not match.url_name:
+            return 'unresolved'
+        return match.view_name
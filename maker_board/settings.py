@@ -31,7 +31,9 @@ ALLOWED_HOSTS = []
 # Application definition
 
 INSTALLED_APPS = [
-    'django.contrib.admin',
+    # Admin modules are autodiscovered on the first admin request (and by
+    # the admin system checks), see maker_board.lazy_urls and maker_board.apps
+    'maker_board.apps.LazyAdminConfig',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -45,10 +47,14 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'maker_board.compression.StreamingGZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.middleware.HashingSaturatedMiddleware',
+    'maker_board.profiling.SamplingProfilerMiddleware',
+    'boards.middleware.AnonymousPageCacheMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -88,6 +94,21 @@ DATABASES = {
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
 
+# Django's PBKDF2 hasher is replaced by one that hashes on a bounded pool of
+# threads, see accounts.hashing
+
+PASSWORD_HASHERS = [
+    'accounts.hashing.BoundedPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+# Upgrades outdated hashes after a login, off the request thread
+AUTHENTICATION_BACKENDS = [
+    'accounts.backends.RehashingModelBackend',
+]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -134,4 +155,59 @@ LOGOUT_REDIRECT_URL = 'home'
 LOGIN_REDIRECT_URL = 'home'
 LOGIN_URL = 'login'
 
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
\ No newline at end of file
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+
+# Request profiling, see maker_board/profiling.py
+# Profile 1 in PROFILER_SAMPLE_RATE requests (0 disables sampling; staff can
+# still profile a single request with ?_profile=1 or ?_profile=pstats)
+PROFILER_SAMPLE_RATE = 0
+PROFILER_INTERVAL = 0.005
+PROFILER_DIR = os.path.join(BASE_DIR, 'profiles')
+
+# The page cache and its purge counters (boards/cache.py) must be shared by
+# every worker process, or a purge only reaches the worker that handled the
+# write and the others serve stale pages until PAGE_CACHE_TIMEOUT. The file
+# cache is shared by the workers of one host; deployments spread over several
+# hosts need memcached here instead.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache'),
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
+}
+
+# Full-page cache for anonymous readers, see boards/middleware.py
+PAGE_CACHE_TIMEOUT = 300
+PAGE_CACHE_URL_NAMES = ['home', 'board_topics']
+# Query parameters those views read; all others are left out of the cache key
+PAGE_CACHE_QUERY_PARAMS = ['sort']
+
+# Hot topics ranking, see boards/ranking.py
+HOT_TOPIC_DECAY = 45000
+HOT_TOPICS_LIMIT = 10
+
+# New topic write path, see boards/writes.py
+# Group commit coalesces concurrent new topics into one transaction per window
+BOARDS_GROUP_COMMIT = False
+BOARDS_GROUP_COMMIT_WINDOW = 0.005
+BOARDS_GROUP_COMMIT_MAX_BATCH = 100
+
+# Listing pages for boards with at least this many topics are streamed in
+# batches of STREAMING_BATCH_SIZE rows, see boards/streaming.py
+STREAMING_LISTING_THRESHOLD = 500
+STREAMING_BATCH_SIZE = 200
+
+# In-process cache of user display fields for listings, see accounts/display.py
+USER_DISPLAY_CACHE_SIZE = 5000
+USER_DISPLAY_CACHE_TTL = 300
+
+# Password hashing pool: threads hashing at once, requests allowed to wait for
+# one before a 503 is returned, and the Retry-After sent with it in seconds.
+# Stored hashes are upgraded to PASSWORD_PBKDF2_ITERATIONS after a login.
+PASSWORD_HASHING_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+PASSWORD_HASHING_QUEUE = 32
+PASSWORD_HASHING_RETRY_AFTER = 5
+PASSWORD_PBKDF2_ITERATIONS = 150000
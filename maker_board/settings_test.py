@@ -0,0 +1,31 @@
+"""
+Settings for the test suite, used by `manage.py test`.
+
+Tests must not depend on the order they run in: check changes with
+`manage.py test --reverse` and `--parallel` as well as a plain run.
+"""
+from .settings import *  # noqa: F401,F403
+
+# Tests create users and log in constantly. Hashing their passwords with a
+# fast hasher keeps PBKDF2's deliberate slowness out of every one of them;
+# the tests of accounts.hashing enable the real hasher themselves.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+# An in-memory SQLite database, which forked --parallel workers each get
+# their own copy of
+DATABASES['default']['TEST'] = {'NAME': None}
+
+# A cache private to each process, so that --parallel workers do not see each
+# other's pages and purges
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+TEST_RUNNER = 'maker_board.test_runner.TimedTestRunner'
+
+# Number of slowest tests reported after each run, see maker_board/test_runner.py
+TEST_SLOWEST_REPORTED = 10
@@ -0,0 +1,90 @@
+"""
+Test runner that reports the slowest tests at the end of a run.
+
+Every test is timed where it runs. Under `--parallel` that is a worker
+process, which sends its timings back to the main process along with the
+rest of its results, so the report covers the whole suite either way.
+"""
+import time
+import unittest
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner, ParallelTestSuite, RemoteTestResult, RemoteTestRunner
+
+
+class TimedRemoteTestResult(RemoteTestResult):
+
+    def startTest(self, test):
+        self.test_started = time.perf_counter()
+        super().startTest(test)
+
+    def stopTest(self, test):
+        self.events.append(('addDuration', self.test_index, time.perf_counter() - self.test_started))
+        super().stopTest(test)
+
+
+class TimedRemoteTestRunner(RemoteTestRunner):
+    resultclass = TimedRemoteTestResult
+
+
+class TimedParallelTestSuite(ParallelTestSuite):
+    runner_class = TimedRemoteTestRunner
+
+
+class TimedTextTestResult(unittest.TextTestResult):
+    '''
+    Durations of the tests run, in seconds, keyed by test id
+    '''
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.durations = {}
+        self.started = {}
+
+    def startTest(self, test):
+        self.started[test.id()] = time.perf_counter()
+        super().startTest(test)
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        started = self.started.pop(test.id(), None)
+        # Tests run in a worker already have the duration it measured
+        if started is not None:
+            self.durations.setdefault(test.id(), time.perf_counter() - started)
+
+    def addDuration(self, test, elapsed):
+        self.durations[test.id()] = elapsed
+
+
+class TimedTestRunner(DiscoverRunner):
+    parallel_test_suite = TimedParallelTestSuite
+
+    def __init__(self, slowest=None, **kwargs):
+        super().__init__(**kwargs)
+        self.slowest = getattr(settings, 'TEST_SLOWEST_REPORTED', 10) if slowest is None else slowest
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--slowest', type=int, metavar='N',
+            help='Number of slowest tests to report, 0 to turn the report off'
+        )
+
+    def get_resultclass(self):
+        # --debug-sql has its own result class and goes without the report
+        return super().get_resultclass() or TimedTextTestResult
+
+    def run_suite(self, suite, **kwargs):
+        result = super().run_suite(suite, **kwargs)
+        durations = getattr(result, 'durations', None)
+        if durations and self.slowest:
+            self.report_slowest(durations)
+        return result
+
+    def report_slowest(self, durations):
+        slowest = sorted(durations.items(), key=lambda item: item[1], reverse=True)[:self.slowest]
+        total = sum(durations.values())
+        print(f'\nSlowest {len(slowest)} of {len(durations)} tests ({total:.2f}s of test time):')
+        for test_id, elapsed in slowest:
+            print(f'{elapsed:8.3f}s  {test_id}')
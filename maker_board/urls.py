@@ -13,14 +13,16 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
 from django.urls import include, path
 
 from boards.views import home
 
+from .lazy_urls import admin_urls, lazy_include
+
 urlpatterns = [
     path('', home, name='home'),
-    path('admin/', admin.site.urls),
+    lazy_include('admin/', admin_urls, namespace='admin'),
     path('boards/', include('boards.urls')),
+    path('api/', include('boards.api_urls')),
     path('accounts/', include('accounts.urls'))
 ]